@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+
+# This script compares a measured point cloud of a DIN 5480-1 spline (from a CMM for example)
+# with the nominal profile made by GearSplineGenerator_Rev4.py. For every measured point it finds
+# the nearest element of the nominal contour (involute flank, tip circle, root fillet or root
+# circle) and the signed normal deviation from it. The deviations are collected per tooth and
+# per flank, and the tooth thickness (shaft) or space width (hub) of every tooth is estimated
+# from the flank deviations and checked against s_min..s_max or e_min..e_max.
+
+# The cloud must be in the gear coordinate system: centered on the gear axis with the first tooth
+# (shaft) or space width (hub) centered on the +X axis, like the generated DXF files. Clouds that
+# are clocked differently can be corrected with the rotation argument (radians).
+
+# A positive deviation means there is more material than nominal (a thicker shaft tooth or a
+# narrower hub space width), a negative deviation means there is less.
+
+# All distances are exact: the normal of an involute is tangent to the base circle, so the normal
+# distance from a point to a flank is the base radius times the polar angle between the point and
+# the flank at the same radius. Points are sorted into teeth by their polar angle, which replaces
+# any search structure, and every tooth is folded onto the upper half of the first tooth.
+
+import numpy as np
+
+import GearSplineGenerator_Rev4 as gsg
+
+FLANK = 0 # Codes of the nominal contour elements in the "element" array
+TIP = 1
+FILLET = 2
+ROOT = 3
+
+# Below is a function that loads a measured point cloud. Every row is x, y[, z] like the points files
+# of GearSplineGenerator_Rev4.py, comma or whitespace delimited.
+def load_cloud(filename):
+    with open(filename) as file:
+        delimiter = "," if "," in file.readline() else None
+    cloud = np.loadtxt(filename, delimiter = delimiter, ndmin = 2)
+    return cloud[:, 0], cloud[:, 1]
+
+def wrap(angle): # Wraps angles into -pi..pi
+    return (angle + np.pi) % (2 * np.pi) - np.pi
+
+# Below is a function that returns the unsigned distance from points (x, y) to a circular arc with
+# center (cx, cy) and radius R that spans mid - half..mid + half, and whether the nearest point of
+# the full circle lies on the arc
+def arc_distance(x, y, cx, cy, R, mid, half):
+    dx = x - cx
+    dy = y - cy
+    dist = np.hypot(dx, dy)
+    on_arc = np.abs(wrap(np.arctan2(dy, dx) - mid)) <= half
+    end1 = np.hypot(x - cx - R * np.cos(mid - half), y - cy - R * np.sin(mid - half))
+    end2 = np.hypot(x - cx - R * np.cos(mid + half), y - cy - R * np.sin(mid + half))
+    return np.where(on_arc, np.abs(dist - R), np.minimum(end1, end2)), dist
+
+# Below is a function that returns the nominal elements of the upper half of the first tooth (shaft)
+# or space width (hub) of a generated gear
+def nominal_elements(gear, side):
+    g = gear
+    if side == "shaft":
+        RadLow, RadHigh = g["rFf1"], g["ra1"] # Radial extent of the involute flank
+        RadTip, RadRoot = g["ra1"], g["rf1"]
+        FilletCenter = RadRoot + g["rho"]
+        width = g["s"]
+    else:
+        RadLow, RadHigh = g["ra2"], g["rFf2"]
+        RadTip, RadRoot = g["ra2"], g["rf2"]
+        FilletCenter = RadRoot - g["rho"]
+        width = g["e"]
+
+    profile = g[side]
+    rows = profile.tooth(0)
+    fil = profile.polyline(rows[profile.segments["type"][rows] == gsg.FILLET_R][0]) # Positive side root fillet of the first tooth
+    x_fil, y_fil = fil[:, 0], fil[:, 1]
+
+    thetaHK = profile.thetaHK
+    rb = g["rb"]
+    RadRange, _, inva2 = gsg.flank_angles(rb, g["rp"], RadLow, RadHigh, width, g["points"])
+    FlankConst = inva2[0] + gsg.invr(RadRange[0], rb) # Polar angle of the upper flank is FlankConst - invr(r)
+
+    elem = {"rb": rb, "RadLow": RadLow, "RadHigh": RadHigh, "FlankConst": FlankConst}
+    FlankTip = FlankConst - gsg.invr(RadTip, rb) # Polar angle where the flank meets the tip circle
+    if side == "shaft":
+        elem["tip"] = (RadTip, FlankTip / 2, FlankTip / 2) # (radius, middle angle, half of the angle span)
+        elem["root"] = (RadRoot, (thetaHK + g["p_sector"] / 2) / 2, (g["p_sector"] / 2 - thetaHK) / 2)
+    else:
+        elem["tip"] = (RadTip, (FlankTip + g["p_sector"] / 2) / 2, (g["p_sector"] / 2 - FlankTip) / 2)
+        elem["root"] = (RadRoot, thetaHK / 2, thetaHK / 2)
+
+    cx = FilletCenter * np.cos(thetaHK)
+    cy = FilletCenter * np.sin(thetaHK)
+    start = np.arctan2(y_fil[0] - cy, x_fil[0] - cx)
+    span = wrap(np.arctan2(y_fil[-1] - cy, x_fil[-1] - cx) - start)
+    elem["fillet"] = (cx, cy, g["rho"], start + span / 2, abs(span) / 2)
+    return elem
+
+# Below is a function that computes the signed normal deviation of every measured point from the
+# nominal profile. It returns the tooth index, flank side (-1 for the negative polar angle side L,
+# +1 for the positive side R), nearest element code and deviation of every point.
+def deviations(gear, X, Y, side = "shaft", rotation = 0):
+    X = np.asarray(X, dtype = float)
+    Y = np.asarray(Y, dtype = float)
+    z1 = gear["z1"]
+    p_sector = gear["p_sector"]
+    sgn = 1 if side == "shaft" else -1 # Material is inside the contour on a shaft and outside it on a hub
+
+    r = np.hypot(X, Y)
+    phi = np.arctan2(Y, X) - rotation
+    tooth = np.rint(phi / p_sector).astype(np.int64) % z1 # Angular bucketing of the points into teeth
+    phi_local = wrap(phi - tooth * p_sector)
+    flank = np.where(phi_local < 0, -1, 1)
+    phi_abs = np.abs(phi_local)
+    x = r * np.cos(phi_abs) # Points folded onto the upper half of the first tooth
+    y = r * np.sin(phi_abs)
+
+    elem = nominal_elements(gear, side)
+    rb = elem["rb"]
+    dist = np.empty((4, len(X)))
+    signed = np.empty((4, len(X)))
+
+    # Involute flank
+    r_c = np.maximum(r, rb)
+    dphi = phi_abs - (elem["FlankConst"] - gsg.invr(r_c, rb)) # Polar angle between the point and the flank at the same radius
+    signed[FLANK] = sgn * rb * dphi
+    RollLength = np.sqrt(r_c**2 - rb**2) - rb * dphi # Distance from the base circle tangent point to the foot on the flank
+    RadFoot = np.hypot(rb, RollLength)
+    on_flank = (r >= rb) & (RollLength >= 0) & (RadFoot >= elem["RadLow"]) & (RadFoot <= elem["RadHigh"])
+    ends = []
+    for R in (elem["RadLow"], elem["RadHigh"]):
+        angle = elem["FlankConst"] - gsg.invr(R, rb)
+        ends.append(np.hypot(x - R * np.cos(angle), y - R * np.sin(angle)))
+    dist[FLANK] = np.where(on_flank, np.abs(signed[FLANK]), np.minimum(*ends))
+
+    # Tip and root circles
+    for code, (R, mid, half) in ((TIP, elem["tip"]), (ROOT, elem["root"])):
+        dist[code] = arc_distance(x, y, 0, 0, R, mid, half)[0]
+        signed[code] = sgn * (r - R)
+
+    # Root fillet. Its center lies outside of the material on both the shaft and the hub.
+    dist[FILLET], FilletDist = arc_distance(x, y, *elem["fillet"])
+    signed[FILLET] = elem["fillet"][2] - FilletDist
+
+    element = np.argmin(dist, axis = 0)
+    index = np.arange(len(X))
+    deviation = np.copysign(dist[element, index], signed[element, index])
+    return tooth, flank, element, deviation
+
+# Below is a function that builds the per tooth report. Every array in the report has one entry per
+# tooth, the flank values are given for the L and R flank of each tooth (see FLANK_L and FLANK_R
+# in GearSplineGenerator_Rev4.py).
+def tooth_report(gear, X, Y, side = "shaft", rotation = 0):
+    z1 = gear["z1"]
+    tooth, flank, element, deviation = deviations(gear, X, Y, side, rotation)
+
+    report = {"side": side, "points": len(deviation), "max_deviation": deviation.max(initial = -np.inf),
+              "min_deviation": deviation.min(initial = np.inf)}
+    DevMin = np.full(z1, np.inf)
+    DevMax = np.full(z1, -np.inf)
+    np.minimum.at(DevMin, tooth, deviation)
+    np.maximum.at(DevMax, tooth, deviation)
+    report["dev_min"] = DevMin # All deviations of the tooth
+    report["dev_max"] = DevMax
+
+    mean = {}
+    for name, sign in (("L", -1), ("R", 1)):
+        on = (element == FLANK) & (flank == sign)
+        count = np.bincount(tooth[on], minlength = z1)
+        FlankMin = np.full(z1, np.inf)
+        FlankMax = np.full(z1, -np.inf)
+        np.minimum.at(FlankMin, tooth[on], deviation[on])
+        np.maximum.at(FlankMax, tooth[on], deviation[on])
+        with np.errstate(invalid = "ignore", divide = "ignore"):
+            mean[name] = np.bincount(tooth[on], deviation[on], minlength = z1) / count
+        report["flank_count_" + name] = count
+        report["flank_min_" + name] = FlankMin
+        report["flank_max_" + name] = FlankMax
+        report["flank_mean_" + name] = mean[name]
+
+    # A normal shift of a flank moves it by (shift / rb) radians, which is (shift / cos(alpha)) on the pitch circle
+    thickness_change = (mean["L"] + mean["R"]) / np.cos(gsg.alpha)
+    if side == "shaft":
+        actual = gear["s"] + thickness_change
+        low, high = gear["s_min"], gear["s_max"]
+    else:
+        actual = gear["e"] - thickness_change
+        low, high = gear["e_min"], gear["e_max"]
+    report["thickness"] = actual # Tooth thickness (shaft) or space width (hub) on the pitch circle
+    report["limits"] = (low, high)
+    report["passed"] = (actual >= low) & (actual <= high) # Teeth without points on both flanks fail
+    return report
+
+# Below is a function that prints a report made by tooth_report
+def print_report(report):
+    name = "tooth thickness" if report["side"] == "shaft" else "space width"
+    low, high = report["limits"]
+    print("")
+    print(report["points"], "points analyzed. Deviation range:", round(report["min_deviation"], 4), "to", round(report["max_deviation"], 4), "mm")
+    print("Allowed", name, "on the pitch circle:", round(low, 4), "-", round(high, 4), "mm")
+    print("Tooth   Flank L min/max (mm)   Flank R min/max (mm)   " + name.capitalize() + " (mm)   Result")
+    for k in range(len(report["thickness"])):
+        print("%5d   %9.4f %9.4f   %9.4f %9.4f   %10.4f   %s" % (k + 1, report["flank_min_L"][k], report["flank_max_L"][k],
+              report["flank_min_R"][k], report["flank_max_R"][k], report["thickness"][k],
+              "pass" if report["passed"][k] else "FAIL"))
+    print(int(np.sum(report["passed"])), "of", len(report["passed"]), "teeth passed")
+
+if __name__ == "__main__":
+    dB = float(input("Enter the Reference Diameter (d_B): "))
+    mod = float(input("Enter the Module (m): "))
+    z1 = int(input("Enter the number of teeth (z): "))
+    TolGrade_s = float(input("Enter the tolerance grade number for the shaft: "))
+    DevLetter_s = input("Enter the deviation grade letter for the shaft: ")
+    TolGrade_e = float(input("Enter the tolerance grade number for the hub: "))
+    DevLetter_e = input("Enter the deviation grade letter for the hub: ")
+    MachMethod = input("Enter the machining method (broaching, hobbing, gear shaping, or cold rolling): ")
+    FilletMethod = input("Enter the creation method for the root fillet (chip-removal or cold rolling): ")
+    side = input("Enter the measured part (shaft or hub): ")
+    filename = input("Enter the point cloud file name: ")
+
+    gear = gsg.generate(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod)
+    X, Y = load_cloud(filename)
+    print_report(tooth_report(gear, X, Y, side))
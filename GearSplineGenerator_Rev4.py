@@ -1,919 +1,1195 @@
-# -*- coding: utf-8 -*-
-"""
-Created on Sat Dec  4 01:34:02 2021
-
-@author: 2018
-"""
-
-# This is a gear generator that creates internal (hub) and external (shaft) 
-# flank-centered gears in accordance with DIN 5480-1, Mar 2006. 
-
-# The designation for these gears is:
-    # Reference Diameter(dB) x Module(m) x Number of teeth(z1) x Tolerance Grade Number, Deviation Letter
-    # Ex: 30 x 1 x 28 x 8j
-    # All lengths are in mm and angles are in radians unless otherwise specified.
-    
-# To generate DXF files of the gear you'd like, simply run the code and input
-# the parameters in your gear's designation. DXF files of an external spline and
-# internal spline will be generated along with files of a single tooth of the 
-# external spline and a single space width of the internal spline.
-
-# DXF files can be imported into most CAD softwares. Once imported, just highlight the 2D profile 
-# and extrude to create a 3D gear. DXF files can also be used to cut the 2D profile into a 3D stock
-# of material on most EDMs.
-
-# IMPORTANT: If you import a points file, the CAD software settings must be in mm.
-# IMPORTANT: The DXF file won't generate if you don't have the ezdxf python library installed
-
-import numpy as np
-import matplotlib.pyplot as plt 
-import ezdxf 
-
-### Inputs
-
-dB = float(input("Enter the Reference Diameter (d_B): "))
-mod = float(input("Enter the Module (m): "))
-z1 = int(input("Enter the number of teeth (z): "))
-TolGrade_s = float(input("Enter the tolerance grade number for the shaft: "))
-DevLetter_s = input("Enter the deviation grade letter for the shaft: ")
-TolGrade_e = float(input("Enter the tolerance grade number for the hub: "))
-DevLetter_e = input("Enter the deviation grade letter for the hub: ")
-MachMethod = input("Enter the machining method (broaching, hobbing, gear shaping, or cold rolling): ")
-FilletMethod = input("Enter the creation method for the root fillet (chip-removal or cold rolling): ")
-
-points = 10 # Must be a whole number. Determines the number of points generated per spline. A higher number is more accurate, but harder on CAD software.
-zcoord = 0 # This defines how far from the X-Y plane that the 2D involute profile will be
-
-#Below is an example of input values
-# dB = 30
-# mod = 1
-# z1 = 28
-# TolGrade_s = 8
-# DevLetter_s = "j"
-# TolGrade_e = 9
-# DevLetter_e = "H"
-# MachMethod = "broaching"
-# FilletMethod = "chip-removal"
-
-### Gear Parameter Calculations
-    # This section calculates all the required parameters necessary to build the gear from
-    # the provided parameters
-if MachMethod == "broaching": # This establishes the dedendum and form clearance coefficients
-    hfp_coef = 0.55
-    cFP_coef = 0.02
-elif MachMethod == "hobbing":
-    hfp_coef = 0.6
-    cFP_coef = 0.07
-elif MachMethod == "gear shaping":
-    hfp_coef = 0.65
-    cFP_coef = 0.12
-elif MachMethod == "cold rolling":
-    hfp_coef = 0.84
-    cFP_coef = 0.12
-else:
-    print("Maching method input is invalid. Must be broaching, hobbing, gear shaping, or cold rolling.")
-
-if FilletMethod == "chip-removal" or "chip-removal machining": # This establishes the fillet root radius coefficient
-    rho_coef = 0.16
-elif FilletMethod == "cold rolling":
-    rho_coef = 0.54
-else:
-    print("Fillet creation method input is invalid. Must be chip-removal or cold rolling")
-
-# Table 4 from 5480-1. Used to determine minimum form clearance (cFmin)
-tab4 = np.zeros([7,3], dtype = float)
-tab4[:, 0] = [25, 28, 30, 35, 40, None, None]
-tab4[:, 1] = [None, 30, 35, 40, 45, 50, None]
-tab4[:, 2] = [None, None, 40, 45, 50, 55, 65]
-tab4 = tab4 * 0.001 # Converts values in the table from microns to mm
-
-# The following two if statements determine the column and row of the cFmin in table 4
-if mod >= 0.5 and mod <= 1.5:
-    tab4_col = 0
-elif mod >= 1.75 and mod <= 4:
-    tab4_col = 1
-elif mod >= 5 and mod <= 10:
-    tab4_col = 2
-else:
-    print("invalid input for Module. Must be 0.5-1.5, 1.75-4, or 5-10")
-
-if dB - round(dB) != 0:
-    print("Invalid input for Reference Diameter. Must be a whole number")
-elif dB > 0 and dB <= 12:
-    tab4_row = 0
-elif dB > 12 and dB <= 25:
-    tab4_row = 1
-elif dB > 25 and dB <= 50:
-    tab4_row = 2
-elif dB > 50 and dB <= 100:
-    tab4_row = 3
-elif dB > 100 and dB <= 200:
-    tab4_row = 4
-elif dB > 200 and dB <= 400:
-    tab4_row = 5
-elif dB > 400:
-    tab4_row = 6
-else:
-    print("Invalid input for Reference Diameter, see table 1 in DIN 5480-1 for preferred values")
-
-cFmin = tab4[tab4_row, tab4_col]
-
-alpha = np.pi / 6 # Pressure angle. For all DIN 5480 gears, this is 30 degrees or pi/6 radians
-pitch = mod * np.pi # Pitch value
-z2 = -z1 # Teeth value representation for the hub
-x1 = (dB / mod - z1 - 1.1) / 2 # Profile shift modification value for the shaft
-x2 = -x1 # Profile shift modification value for the hub
-hap = x1 * mod # Addendum
-hfp = hfp_coef * mod # Dedendum
-hP = hap + hfp # Tooth height
-cP = hfp - hap # Bottom clearance
-rho = rho_coef * mod # Root fillet radius
-dp = mod*z1 # Pitch diameter
-db = mod* z1 * np.cos(alpha) # Base diameter. This is what the involute profile is drawn from
-
-da2 = abs(mod * (z2 + 2 * x2 + 0.9)) # Hub tip diameter
-df2 = abs(mod * z2 + 2 * x2 * mod - 2 * hfp) # Hub root diameter
-
-da1 = mod * (z1 + 2 * x1 + 0.9) # Shaft tip diameter
-df1 = mod * z1 + 2 * x1 * mod - 2 * hfp # Shaft root diameter
-dFf1 = da2 - 2 * cFmin # Shaft form circle diameter
-dFf2 = da1 + 2 * cFmin # Hub form circle diameter
-    
-cFP = mod * cFP_coef
-
-rb = db/2 # Radius of base circle.
-rp = dp / 2 # Pitch radius
-ra1 = da1 / 2 # Shaft tip radius
-rf1 = df1 / 2 # Shaft root radius
-rFf1 = dFf1 / 2 # Shaft form circle radius
-ra2 = da2 / 2 # Hub tip radius
-rf2 = df2 / 2 # Hub root radius
-rFf2 = dFf2 / 2 # Hub form circle radius
- 
-### Tooth thickness and space width values and tolerances calculations
- # This section creates tables necessary for finding the shaft tooth thickness (s1)
- # and hub space width (e2) values and calculates those values and their associated
- # tolerances based on the inputted tolerance grade and deviation grade.
-
-# The following is the first section of Table 7, which holds deviation space width (Ae) and 
-# deviation tooth thickness (As) values
-tab71 = np.zeros([18, 9], dtype = float)
-tab71[0, :] = [200, 180, 160, 140, 125, 110, 100, 90, 80]
-tab71[1, :] = [180, 162, 144, 126, 112, 99, 90, 81, 72]
-tab71[2, :] = [160, 144, 128, 112, 100, 88, 80, 72, 64]
-tab71[3, :] = [140, 126, 112, 98, 88, 77, 70, 63, 56]
-tab71[4, :] = [120, 108, 96, 84, 75, 66, 60, 54, 48]
-tab71[5, :] = [100, 90, 80, 70, 62, 55, 50, 45, 40]
-tab71[6, :] = [80, 72, 64, 56, 50, 44, 40, 36, 32]
-tab71[7, :] = [60, 54, 48, 42, 37, 33, 30, 27, 24]
-tab71[8, :] = [40, 36, 32, 28, 25, 22, 20, 18, 16]
-tab71[9, :] = [20, 18, 16, 14, 12, 11, 10, 9, 8]
-tab71[11, :] = -tab71[9, :]
-tab71[12, :] = -tab71[8, :]
-tab71[13, :] = -tab71[7, :]
-tab71[14, :] = -tab71[6, :] 
-tab71[15, :] = -tab71[4, :]
-tab71[16, :] = -tab71[2, :]
-tab71[17, :] = -tab71[0, :]
-tab71 = tab71 * 0.001 # Converts table values from microns to mm
-
-# The following is the second section of Table 7, which provides actual and effective
-# tolerance values for Ae and As
-tab72 = np.zeros([30, 3], dtype = float)
-tab72[:, 0] = [12, 14, 16, 18, 20, 22, 25, 28, 32, 36, 40, 45, 50, 56, 63, 71, 80, 90, 100, 112, 125, 140, 160, 180, 200, 224, 250, 280, 320, 360]
-tab72[:, 1] = [8, 9, 10, 11, 12, 14, 16, 18, 20, 22, 25, 28, 32, 36, 40, 45, 50, 56, 63, 71, 80, 90, 100, 112, 125, 140, 160, 175, 200, 225]
-tab72[:, 2] = [4, 5, 6, 7, 8, 8, 9, 10, 12, 14, 15, 17, 18, 20, 23, 26, 30, 34, 37, 41, 45, 50, 60, 68, 75, 84, 90, 105, 120, 135]
-tab72 = tab72 * 0.001 # Converts table values from microns to mm
-
-# The following two if statments determine the rows and columns that Ae and As are
-# on in Table 7
-if dB > 0 and dB <= 12:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 8
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 7
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 6
-elif dB > 12 and dB <= 25:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 7
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 6
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 5
-elif dB > 25 and dB <= 50:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 6
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 5
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 4
-elif dB > 50 and dB <= 100:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 5
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 4
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 3
-elif dB > 100 and dB <= 200:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 4
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 3
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 2
-elif dB > 200 and dB <= 400:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 3
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 2
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 1
-elif dB > 400:
-    if mod >= 0.5 and mod <= 1.5:
-        tab71_col = 2
-    elif mod >= 1.75 and mod <= 4:
-        tab71_col = 1
-    elif mod >= 5 and mod <= 10:
-        tab71_col = 0
-        
-def tab71row(deviation_letter):    
-    if deviation_letter == "v":
-        tab71_row = 0
-    elif deviation_letter == "u":
-        tab71_row = 1
-    elif deviation_letter == "t":
-        tab71_row = 2
-    elif deviation_letter == "s":
-        tab71_row = 3
-    elif deviation_letter == "r":
-        tab71_row = 4
-    elif deviation_letter == "p":
-        tab71_row = 5
-    elif deviation_letter == "n":
-        tab71_row = 6
-    elif deviation_letter == "m":
-        tab71_row = 7
-    elif deviation_letter == "k" or deviation_letter == "F":
-        tab71_row = 8
-    elif deviation_letter == "j" or deviation_letter == "G":
-        tab71_row = 9
-    elif deviation_letter == "h" or deviation_letter == "H":
-        tab71_row = 10
-    elif deviation_letter == "g" or deviation_letter == "J":
-        tab71_row = 11
-    elif deviation_letter == "f" or deviation_letter == "K":
-        tab71_row = 12
-    elif deviation_letter == "e" or deviation_letter == "M":
-        tab71_row = 13
-    elif deviation_letter == "d":
-        tab71_row = 14
-    elif deviation_letter == "c":
-        tab71_row = 15
-    elif deviation_letter == "b":
-        tab71_row = 16
-    elif deviation_letter == "a":
-        tab71_row = 17
-    else:
-        print("Invalid deviation letter input, see table 9 for recommendations based on fit types.")
-    return tab71_row
-
-# The following if statement determines the row that the space width and tooth thickness deviations are
-# on in Table 7
-def tab72row(tolerance_grade):
-    if tolerance_grade - round(tolerance_grade) != 0:
-        print("Tolerance Grade Number input is invalid. Must be a whole number.")
-    elif tolerance_grade == 5:
-        if tab71_col == 8:
-            tab72_row = 0
-        elif tab71_col == 7:
-            tab72_row = 1
-        elif tab71_col == 6:
-            tab72_row = 2
-        elif tab71_col == 5:
-            tab72_row = 3
-        elif tab71_col == 4:
-            tab72_row== 4
-        elif tab71_col == 3:
-            tab72_row = 5
-        elif tab71_col == 2:
-            tab72_row = 6
-        elif tab71_col == 1:
-            tab72_row = 7
-        elif tab71_col == 0:
-            tab72_row = 8
-    elif tolerance_grade == 6:
-        if tab71_col == 8:
-            tab72_row = 3
-        elif tab71_col == 7:
-            tab72_row = 4
-        elif tab71_col == 6:
-            tab72_row = 5
-        elif tab71_col == 5:
-            tab72_row = 6
-        elif tab71_col == 4:
-            tab72_row = 7
-        elif tab71_col == 3:
-            tab72_row = 8
-        elif tab71_col == 2:
-            tab72_row = 9
-        elif tab71_col == 1:
-            tab72_row = 10
-        elif tab71_col == 0:
-            tab72_row = 11
-    elif tolerance_grade == 7:
-        if tab71_col == 8:
-            tab72_row = 6
-        elif tab71_col == 7:
-            tab72_row = 7
-        elif tab71_col == 6:
-            tab72_row = 8
-        elif tab71_col == 5:
-            tab72_row = 9
-        elif tab71_col == 4:
-            tab72_row = 10
-        elif tab71_col == 3:
-            tab72_row = 11
-        elif tab71_col == 2:
-            tab72_row = 12
-        elif tab71_col == 1:
-            tab72_row = 13
-        elif tab71_col == 0:
-            tab72_row = 14
-    elif tolerance_grade == 8:
-        if tab71_col == 8:
-            tab72_row = 9
-        elif tab71_col == 7:
-            tab72_row = 10
-        elif tab71_col == 6:
-            tab72_row = 11
-        elif tab71_col == 5:
-            tab72_row = 12
-        elif tab71_col == 4:
-            tab72_row = 13
-        elif tab71_col == 3:
-            tab72_row = 14
-        elif tab71_col == 2:
-            tab72_row = 15
-        elif tab71_col == 1:
-            tab72_row = 16
-        elif tab71_col == 0:
-            tab72_row = 17
-    elif tolerance_grade == 9:
-        if tab71_col == 8:
-            tab72_row = 12
-        elif tab71_col == 7:
-            tab72_row = 13
-        elif tab71_col == 6:
-            tab72_row = 14
-        elif tab71_col == 5:
-            tab72_row = 15
-        elif tab71_col == 4:
-            tab72_row = 16
-        elif tab71_col == 3:
-            tab72_row = 17
-        elif tab71_col == 2:
-            tab72_row = 18
-        elif tab71_col == 1:
-            tab72_row = 19
-        elif tab71_col == 0:
-            tab72_row = 20
-    elif tolerance_grade == 10:
-        if tab71_col == 8:
-            tab72_row = 15
-        elif tab71_col == 7:
-            tab72_row = 16
-        elif tab71_col == 6:
-            tab72_row = 17
-        elif tab71_col == 5:
-            tab72_row = 18
-        elif tab71_col == 4:
-            tab72_row = 19
-        elif tab71_col == 3:
-            tab72_row = 20
-        elif tab71_col == 2:
-            tab72_row = 21
-        elif tab71_col == 1:
-            tab72_row = 22
-        elif tab71_col == 0:
-            tab72_row = 23
-    elif tolerance_grade == 11:
-        if tab71_col == 8:
-            tab72_row = 18
-        elif tab71_col == 7:
-            tab72_row = 19
-        elif tab71_col == 6:
-            tab72_row = 20
-        elif tab71_col == 5:
-            tab72_row = 21
-        elif tab71_col == 4:
-            tab72_row = 22
-        elif tab71_col == 3:
-            tab72_row = 23
-        elif tab71_col == 2:
-            tab72_row = 24
-        elif tab71_col == 1:
-            tab72_row = 25
-        elif tab71_col == 0:
-            tab72_row = 26
-    elif tolerance_grade == 12:
-        if tab71_col == 8:
-            tab72_row = 21
-        elif tab71_col == 7:
-            tab72_row = 22
-        elif tab71_col == 6:
-            tab72_row = 23
-        elif tab71_col == 5:
-            tab72_row = 24
-        elif tab71_col == 4:
-            tab72_row = 25
-        elif tab71_col == 3:
-            tab72_row = 26
-        elif tab71_col == 2:
-            tab72_row = 27
-        elif tab71_col == 1:
-            tab72_row = 28
-        elif tab71_col == 0:
-            tab72_row = 29
-    else:
-        print("Tolerance Grade Number input is invalid. Must be 5-12")
-    return tab72_row
-    
-# Tolerance calculations:
-Ae = tab71[tab71row(DevLetter_e), tab71_col] # Space width deviation
-T_act_e = tab72[tab72row(TolGrade_e), 1] # Space width actual tolerance
-T_eff_e = tab72[tab72row(TolGrade_e), 2] # Space width effective tolerance
-
-As = tab71[tab71row(DevLetter_s), tab71_col] # Tooth thickness deviation
-T_act_s = tab72[tab72row(TolGrade_s), 1] # Tooth thickness actual tolerance
-T_eff_s = tab72[tab72row(TolGrade_s), 2] # Tooth thickness effective tolerance
-
-s1 = mod * np.pi / 2 + 2 * x1 * mod * np.tan(alpha) # Circular tooth thickness of the shaft measured on the pitch diameter
-s_vmax = s1 + As # Max effective tolerance
-s_max = s1 + As - T_eff_s # Max actual reference tolerance
-s_min = s1 + As - T_act_s - T_eff_s # Min actual tolerance
-s = s_min + (s_max - s_min) / 2 # Arbitrary nominal value that lies in the middle of the tolerance
-
-e2 = s1 # Circular space width of the hub measured on the pitch diameter
-e_max = e2 + Ae + T_act_e + T_eff_e # Max actual tolerance
-e_min = e2 + Ae + T_eff_e # Min actual reference tolerance
-e_vmin = e2 + Ae # Min effective tolerance
-e = e_min + (e_max - e_min) / 2 # Arbitrary nominal value that lies in the middle of the tolerance
-
-### Spline Generation Calculations:
-    
-# Shaft Involute Sides:
-def inv(theta): # Involute function of an angle
-    inv_angle = np.tan(theta) - theta
-    return inv_angle
-
-def invr(radius): # Involute angle outputted for a given radius relative to the base circle radius
-    angle = np.arccos(rb/radius)
-    inv_angle = inv(angle)
-    return inv_angle
-
-p_sector = 2*np.pi / z1 # Central angle of one pitch
-sector_range = np.linspace(0, 2*np.pi - p_sector, z1) # Polar angle at the start of each pitch in the gear profile
-
-# Below is a function that will return the involute profile x and y coordinates of one tooth side for every tooth 
-# in the gear
-def invcoord(RadRange, InvAng): 
-    x_inva = []
-    y_inva = []
-    for angle in sector_range:
-        x_inva.append(RadRange * np.cos(InvAng + angle))
-        y_inva.append(RadRange * np.sin(InvAng + angle))
-    x_inva = np.transpose(np.array(x_inva))
-    y_inva = np.transpose(np.array(y_inva))
-    return x_inva, y_inva
-
-sector_s = s / rp # Central angle encompassing one tooth thickness
-inva_tooth_s = invr(rp) # Polar angle to the involute profile on the tooth thickness
-
-RadRange_s = np.linspace(rFf1, ra1, points) # Range of radii along involute profile of the shaft
-inva1s = invr(RadRange_s) # Range of involute angles along the tooth side profile
-inva_sector_s = 2 * (inva_tooth_s - inva1s[0]) + sector_s # Central angle between the base of two involute profiles of a tooth
-inva1s = inva1s - inva1s[0] - inva_sector_s/2 # Centers the first tooth along the x axis
-
-x_inva1s = invcoord(RadRange_s, inva1s)[0] # X coordinates for first side of involute profile
-y_inva1s = invcoord(RadRange_s, inva1s)[1] # Y coordinates for first side of involute profile
-
-inva2s = -inva1s
-
-x_inva2s = invcoord(RadRange_s, inva2s)[0] # X coordinates for second side of involute profile
-y_inva2s = invcoord(RadRange_s, inva2s)[1] # Y coordinates for second side of involute profile
-
-# Hub Involute Sides:
-sector_e = e / rp # Central angle encompassing one space width
-
-RadRange_e = np.linspace(ra2, rFf2, points) # Range of radii along involute profile of the hub
-inva1e = invr(RadRange_e) # Range of involute angles along the space width side profile
-inva_sector_e = 2 * (inva_tooth_s - inva1e[0]) + sector_e # Central angle between the base of two involute profiles of a space width
-inva1e = inva1e - inva1e[0] - inva_sector_e/2 # Centers the first space width along the x axis
-
-x_inva1e = invcoord(RadRange_e, inva1e)[0] # X coordinates for first side of involute profile
-y_inva1e = invcoord(RadRange_e, inva1e)[1] # Y coordinates for first side of involute profile
-
-inva2e = -inva1e
-
-x_inva2e = invcoord(RadRange_e, inva2e)[0] # X coordinates for second side of involute profile
-y_inva2e = invcoord(RadRange_e, inva2e)[1] # Y coordinates for second side of involute profile
-
-# Shaft Tooth Tip Generation
-
-# Below is a function that generates tooth tip or root circle coordinates
-def ArcCoord(TipRadius, AngRang):
-    xa = []
-    ya = []
-    for angle in sector_range:
-        xa.append(TipRadius * np.cos(AngRang + angle)) 
-        ya.append(TipRadius * np.sin(AngRang + angle))
-    xa = np.transpose(np.array(xa))
-    ya = np.transpose(np.array(ya))
-    return xa, ya
-
-ra1_AngRang = np.linspace(inva1s[-1], inva2s[-1], points) # Range of polar angles along one tooth tip
-xa1 = ArcCoord(ra1, ra1_AngRang)[0] # X coordinates for points along a tooth tip
-ya1 = ArcCoord(ra1, ra1_AngRang)[1] # Y coordinates for points along a tooth tip
-
-# Hub Tooth Tip Generation
-ra2_AngRang1 = np.linspace(inva2e[0], p_sector / 2, points) # Range of polar angles along half of a hub tooth tip
-xa2_1 = ArcCoord(ra2, ra2_AngRang1)[0] # X coordinates for points along half a hub tooth tip
-ya2_1 = ArcCoord(ra2, ra2_AngRang1)[1] # Y coordinates for points along half a hub tooth tip
-
-ra2_AngRang2 = -ra2_AngRang1 # Range of polar angles along another half of a hub tooth tip
-xa2_2 = ArcCoord(ra2, ra2_AngRang2)[0] # X coordinates for points along half a hub tooth tip
-ya2_2 = ArcCoord(ra2, ra2_AngRang2)[1] # Y coordinates for points along half a hub tooth tip
-
-# Shaft Root Fillet Generation:
-
-# Below is a function that generates the coordinates for the root fillet of one side of a gear tooth
-def fillet(FormRad, RootRad, InvAng):
-    if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
-        H = (RootRad + rho) * np.cos(InvAng) # X coordinate of the center of the root fillet circle on shaft
-        K = (RootRad + rho) * np.sin(InvAng) # Y coordinate of the center of the root fillet circle on shaft
-    else: # Defining parameters for root fillet circle on the hub
-        H = (RootRad - rho) * np.cos(InvAng) # X coordinate of the center of the root fillet circle on hub
-        K = (RootRad - rho) * np.sin(InvAng) # Y coordinate of the center of the root fillet circle on hub
-    
-    aq = (K**2 / H**2) + 1 # "a" term of the quadratic equation
-    bq = -(K / H**2) * (FormRad**2 - rho**2 + K**2 - H**2) - 2 * K # "b" term of the quadratic equation
-    cq = ((FormRad**2 - rho**2 + K**2 - H**2) / (2 * H))**2 + K**2- rho**2 # "c" term of the quadratic equation
-    
-    y_int = (-bq + (bq**2 - 4 * aq * cq)**0.5) / (2 * aq) # Quadratic formula solving for y coordinate of root fillet circle and form circle intercept
-    x_int = (FormRad**2 - y_int**2)**0.5 # x coordinate of root fillet circle and form circle intercept
-    
-    theta_int_Ff = np.arccos(x_int / FormRad) # Polar angle to fillet circle and form circle intercept from form circle center
-    
-    if FormRad > RootRad:
-        thetaHK = theta_int_Ff
-    else:
-        thetaHK = InvAng - (theta_int_Ff - InvAng)
-    
-    # Now that thetaHK has been redefined, the lines of code solving for the intercept must be repeated to update the intercept point
-    if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
-        H = (RootRad + rho) * np.cos(thetaHK) # X coordinate of the center of the root fillet circle on shaft
-        K = (RootRad + rho) * np.sin(thetaHK) # Y coordinate of the center of the root fillet circle on shaft
-    else: # Defining parameters for root fillet circle on the hub
-        H = (RootRad - rho) * np.cos(thetaHK) # X coordinate of the center of the root fillet circle on hub
-        K = (RootRad - rho) * np.sin(thetaHK) # Y coordinate of the center of the root fillet circle on hub
-   
-    aq = (K**2 / H**2) + 1 # "a" term of the quadratic equation
-    bq = -(K / H**2) * (FormRad**2 - rho**2 + K**2 - H**2) - 2 * K # "b" term of the quadratic equation
-    cq = ((FormRad**2 - rho**2 + K**2 - H**2) / (2 * H))**2 + K**2- rho**2 # "c" term of the quadratic equation
-   
-    y_int = (-bq + (bq**2 - 4 * aq * cq)**0.5) / (2 * aq) # Quadratic formula solving for y coordinate of root fillet circle and form circle intercept
-    x_int = (FormRad**2 - y_int**2)**0.5 # x coordinate of root fillet circle and form circle intercept
-    theta_int_fillet = np.arccos((x_int - H) / rho) # Polar angle to fillet circle and form circle intercept on the fillet circle center
-    
-    def fillet2(thetaHK, theta_int_fillet, offset):
-        x_fil = []
-        y_fil = []
-        for angle in sector_range:
-            if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
-                H = (RootRad + rho) * np.cos(thetaHK + angle) # X coordinate of the center of the root fillet circle on shaft
-                K = (RootRad + rho) * np.sin(thetaHK + angle) # Y coordinate of the center of the root fillet circle on shaft
-                FilletAngRang = np.linspace(thetaHK + offset + angle, (thetaHK + offset) + ((thetaHK + offset) - theta_int_fillet) + angle, points)
-            else: # Defining parameters for root fillet circle on the hub
-                H = (RootRad - rho) * np.cos(thetaHK + angle) # X coordinate of the center of the root fillet circle on hub
-                K = (RootRad - rho) * np.sin(thetaHK + angle) # Y coordinate of the center of the root fillet circle on hub
-                FilletAngRang = np.linspace(thetaHK + angle, theta_int_fillet + angle, points)
-            x_fil.append(H + rho * np.cos(FilletAngRang))
-            y_fil.append(K + rho * np.sin(FilletAngRang))
-
-        x_fil = np.transpose(np.array(x_fil)) # X coordinates of root fillets on one side of the tooth
-        y_fil = np.transpose(np.array(y_fil)) # Y coordinates of root fillets on one side of the tooth
-        return x_fil, y_fil
-    
-    x_fil1 = fillet2(thetaHK, theta_int_fillet, np.pi)[0]
-    y_fil1 = fillet2(thetaHK, theta_int_fillet, np.pi)[1]
-    x_fil2 = fillet2(-thetaHK, -theta_int_fillet, -np.pi)[0]
-    y_fil2 = fillet2(-thetaHK, -theta_int_fillet, -np.pi)[1]
-    
-    return x_fil1, y_fil1, x_fil2, y_fil2, thetaHK
-
-fillet_s = fillet(rFf1, rf1, inva2s[0])
-x_fil1_s = fillet_s[0] # Shaft root fillet x coordinates
-y_fil1_s = fillet_s[1] # Shaft root fillet y coordinates
-x_fil2_s = fillet_s[2] # Shaft root fillet x coordinates
-y_fil2_s = fillet_s[3] # Shaft root fillet y coordinates
-
-# Hub Root Fillet Generation:
-fillet_e = fillet(rFf2, rf2, inva2e[-1])
-x_fil1_e = fillet_e[0] # Hub root fillet x coordinates
-y_fil1_e = fillet_e[1] # Hub root fillet y coordinates
-x_fil2_e = fillet_e[2] # Hub root fillet x coordinates
-y_fil2_e = fillet_e[3] # Hub root fillet y coordinates
-
-# Shaft Root Circle Generation:
-rf1_AngRang1 = np.linspace(p_sector/2, fillet_s[4], points)
-xf1_1 = ArcCoord(rf1, rf1_AngRang1)[0]
-yf1_1 = ArcCoord(rf1, rf1_AngRang1)[1]
-
-rf1_AngRang2 = -rf1_AngRang1
-xf1_2 = ArcCoord(rf1, rf1_AngRang2)[0]
-yf1_2 = ArcCoord(rf1, rf1_AngRang2)[1]
-
-# Hub Root Circle Generation:
-rf2_AngRang = np.linspace(fillet_e[4], -fillet_e[4], points)
-xf2 = ArcCoord(rf2, rf2_AngRang)[0]
-yf2 = ArcCoord(rf2, rf2_AngRang)[1]
-
-### Measurement Over Pins
-    # This section calculates the pin diameter and length of the measurement across pins when
-    # The are put on either side of the gear. This measurement can be used when performing
-    # quality assurance on the gear, to insure the involute sides are within their tolerances
-
-def pins(z, x):
-    eta = (np.pi/(2*z) - inv(alpha)) - 2*x*np.tan(alpha)/z
-    alpha_p = np.arccos(z * mod * np.cos(alpha) / ((z + 2 * x) * mod))
-    phi = np.tan(alpha_p) + eta
-    d_pin = z * mod * np.cos(alpha) * (inv(phi) + eta) # Ideal diameter of pins used to measure distance across the gear
-    d_pin = round(2 * d_pin) / 2 # Rounded diameter to the nearest 0.5 that a gauge pin could match
-
-    # inv_phi is the involute function of angle phi, which must be recalculated now that d_pin has changed
-    inv_phi = d_pin/(z * mod * np.cos(alpha)) - np.pi / (2 * z) + inv(alpha) + 2 * x * np.tan(alpha) / z
-    
-    # Below, phi and the for loop under it calculate the perform the inverse involute function on inv_phi in order to find the angle phi.
-    phi = 1.441 * inv_phi**(1 / 3) - 0.374 * inv_phi
-    for n in range(0, 5):
-        phi = phi + (inv_phi - inv(phi)) / (np.tan(phi))**2
-        
-    if z % 2 == 0: # The outer most if/else statement determines whether the number of teeth is even or odd
-        if z1 > 0: # The two if statements embedded in the primary if statement determine if an internal or external (hub) is being measured
-            MoP = z * mod * np.cos(alpha) / np.cos(phi) + d_pin
-        elif z1 < 0:
-            MoP = z * mod * np.cos(alpha) / np.cos(phi) - d_pin
-    else:
-        if z1 > 0:
-            MoP = z * mod * np.cos(alpha) / (np.cos(phi)) * np.cos((np.pi / 2) / z1) + d_pin
-        elif z1 < 0:
-            MoP = z * mod * np.cos(alpha) / (np.cos(phi)) * np.cos((np.pi / 2) / z1) - d_pin
-    return abs(MoP), d_pin # MoP is the Measurement over Pins. d_pin is the practical diameter of the pins
-    
-MoP_shaft = pins(z1, x1)[0]
-d_pin_shaft = pins(z1, x1)[1]
-print("")
-print("The external spline measurement across pins is", round(MoP_shaft, 4), "mm", "using pins with a diameter of", d_pin_shaft, "mm")
-
-MoP_hub = pins(z2, x2)[0]
-d_pin_hub = pins(z2, x2)[1]
-print("The internal spline measurement across pins is", round(MoP_hub, 4), "mm", "using pins with a diameter of", d_pin_hub, "mm")
-print("The root fillet radius is", rho, "mm")
-    
-### Plot Reference Lines Generation
-    # This section of the code was made to show important gear parameters their plots
-
-def onearc(CircRad, AngRang):
-    x = CircRad * np.cos(AngRang)
-    y = CircRad * np.sin(AngRang)
-    return x, y
-
-PitchCircX = onearc(rp, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Pitch circle x coordinates
-PitchCircY = onearc(rp, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Pitch circle y coordinates
-
-RootCircX_s = onearc(rf1, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Shaft Root circle x coordinates
-RootCircY_s = onearc(rf1, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Shaft Root circle y coordinates
-
-FormCircX_s =onearc(rFf1, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Shaft Form circle x coordinates
-FormCircY_s = onearc(rFf1, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Shaft Form circle y coordinates
-
-ToothThickX = onearc(rp, np.linspace(-sector_s/2, sector_s/2, points))[0] # Shaft tooth thickness X coordinates
-ToothThickY = onearc(rp, np.linspace(-sector_s/2, sector_s/2, points))[1] # Shaft tooth thickness Y coordinates
-
-TipCircX_s = onearc(ra1, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Shaft tip circle X coordinates
-TipCircY_s = onearc(ra1, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Shaft tip circle Y coordinates
-
-RootCircX_e = onearc(rf2, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Hub Root circle x coordinates
-RootCircY_e = onearc(rf2, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Hub Root circle y coordinates
-
-FormCircX_e = onearc(rFf2, np.linspace(-p_sector/2, p_sector/2, 2*points))[0] # Hub Form circle x coordinates
-FormCircY_e = onearc(rFf2, np.linspace(-p_sector/2, p_sector/2, 2*points))[1] # Hub Form circle y coordinates
-
-SpaceWidX = onearc(rp, np.linspace(-sector_e/2, sector_e/2, points))[0] # Hub tooth thickness X coordinates
-SpaceWidY = onearc(rp, np.linspace(-sector_e/2, sector_e/2, points))[1] # Hub tooth thickness Y coordinates
-
-TipCircX_e = onearc(ra2, np.linspace(-p_sector * 0.65, p_sector * 0.65, 2*points))[0] # Hub tip circle X coordinates
-TipCircY_e = onearc(ra2, np.linspace(-p_sector * 0.65, p_sector * 0.65, 2*points))[1] # Hub tip circle Y coordinates
-
-#ToothAngRang = np.linspace(-sector_s / 2, sector_s / 2, points)
-#xtooth = rp * np.cos(ToothAngRang)
-#ytooth = rp * np.sin(ToothAngRang)
-#plt.figure(1)
-#plt.plot(xtooth, ytooth)
-
-### Space width test
-    # This section of the code was made to check the thickness of the space width so that the 
-    # accuracy of the program can be verified.
-#ToothAngRang2 = np.linspace(-sector_e / 2, sector_e / 2, points)
-#xtooth2 = rp * np.cos(ToothAngRang2)
-#ytooth2 = rp * np.sin(ToothAngRang2)
-#plt.figure(3)
-#plt.plot(xtooth2, ytooth2)
-
-
-### Spline Profile Plots
-
-# Shaft Plot of one tooth:
-plt.figure(1)
-plt.title("Plot of One Shaft Gear Tooth (mm)")
-plt.plot(x_inva1s[:, 0], y_inva1s[:, 0], x_inva2s[:, 0], y_inva2s[:, 0]) # Involute Sides
-plt.plot(xa1[:, 0], ya1[:, 0]) # Tooth Tip
-plt.plot(x_fil1_s[:, 0], y_fil1_s[:, 0], x_fil2_s[:, 0], y_fil2_s[:, 0]) # Root Fillets
-plt.plot(xf1_1[:, 0], yf1_1[:, 0], xf1_2[:, 0], yf1_2[:, 0]) # Root Circle
-
-plt.plot(PitchCircX, PitchCircY, '--', label = 'Pitch Circle, d = ' + str(round(dp,2))) # Spline parameters for reference
-plt.plot(RootCircX_s, RootCircY_s, '--', label = 'Root Circle, d_f1 = ' + str(round(df1,2))) 
-plt.plot(TipCircX_s, TipCircY_s, '--', label = 'Tip Circle, d_a1 = ' + str(round(da1,2)))
-plt.plot(FormCircX_s, FormCircY_s, '--', label = 'Form Circle, d_Ff1 = ' + str(round(dFf1,2)))
-plt.plot(ToothThickX, ToothThickY, linewidth = 3, label = 'Tooth Thickness, s1 = ' + str(round(s_min,4)) + ' - ' +str(round(s_max,4))) 
-plt.plot(ra1 * np.cos(-p_sector), ra1 * np.sin(-p_sector)) # Point to help position the plot to accomadate for the label
-plt.legend(loc = 'lower right')
-
-# Shaft Plot of the entire spline
-plt.figure(2)
-plt.title("Plot of the Shaft Involute Spline (mm)")
-plt.plot(x_inva1s, y_inva1s, x_inva2s, y_inva2s)  # Involute Sides 
-plt.plot(xa1, ya1) # Tooth Tip
-plt.plot(x_fil1_s, y_fil1_s, x_fil2_s, y_fil2_s) # Root Fillets
-plt.plot(xf1_1, yf1_1, xf1_2, yf1_2) # Root Circle
-    
-# Hub Plot of one space width
-plt.figure(3)
-plt.title("Plot of One Hub Gear Tooth (mm)")
-plt.plot(x_inva1e[:, 0], y_inva1e[:, 0], x_inva2e[:, 0], y_inva2e[:, 0])  # Involute Sides 
-plt.plot(xa2_1[:, 0], ya2_1[:, 0], xa2_2[:, 0], ya2_2[:, 0]) # Hub Tooth Tip (half of a tip on each side of the space width)
-plt.plot(x_fil1_e[:, 0], y_fil1_e[:, 0], x_fil2_e[:, 0], y_fil2_e[:, 0]) # Root Fillets    
-plt.plot(xf2[:, 0], yf2[:, 0]) # Root Circle
-
-plt.plot(PitchCircX, PitchCircY, '--', label = 'Pitch Circle, d = ' + str(round(dp,2))) # Spline parameters for reference
-plt.plot(RootCircX_e, RootCircY_e, '--', label = 'Root Circle, d_f2 = ' + str(round(df2,2))) 
-plt.plot(TipCircX_e, TipCircY_e, '--', label = 'Tip Circle, d_a2 = ' + str(round(da2,2)))
-plt.plot(FormCircX_e, FormCircY_e, '--', label = 'Form Circle, d_Ff2 = ' + str(round(dFf2,2)))
-plt.plot(SpaceWidX, SpaceWidY, linewidth = 3, label = 'Space Width, e2 = ' + str(round(e_min,4)) + ' - ' +str(round(e_max,4))) 
-plt.plot(rf2 * np.cos(-p_sector), rf2 * np.sin(-p_sector)) # Point to help position the plot to accomadate for the label
-plt.legend(loc = 'lower right')
-
-# Hub Plot of the entire spline
-plt.figure(4)
-plt.title("Plot of the Hub Involute Spline (mm)")
-plt.plot(x_inva1e, y_inva1e, x_inva2e, y_inva2e) # Involute Sides
-plt.plot(xa2_1, ya2_1, xa2_2, ya2_2) # Hub Tooth Tip
-plt.plot(x_fil1_e, y_fil1_e, x_fil2_e, y_fil2_e) # Root Fillets 
-plt.plot(xf2, yf2) # Root Circle
-
-### Points File Generation:
-
-# Shaft Tooth and Hub Space Width:
-ToothListX = (x_inva1s[:, 0], x_inva2s[:, 0], xa1[:, 0], x_fil1_s[:, 0], x_fil2_s[:, 0], xf1_1[:, 0], xf1_2[:, 0])
-ToothListY = (y_inva1s[:, 0], y_inva2s[:, 0], ya1[:, 0], y_fil1_s[:, 0], y_fil2_s[:, 0], yf1_1[:, 0], yf1_2[:, 0])
-SpaceListX = (x_inva1e[:, 0], x_inva2e[:, 0], xa2_1[:, 0], xa2_2[:, 0], x_fil1_e[:, 0], x_fil2_e[:, 0], xf2[:, 0]) 
-SpaceListY = (y_inva1e[:, 0], y_inva2e[:, 0], ya2_1[:, 0], ya2_2[:, 0], y_fil1_e[:, 0], y_fil2_e[:, 0], yf2[:, 0])
-
-ToothX = []
-ToothY = []
-SpaceX = []
-SpaceY = []
-for m in range(0, len(ToothListX)):
-    ToothX = np.append(ToothX, ToothListX[m])
-    ToothY = np.append(ToothY, ToothListY[m])
-    SpaceX = np.append(SpaceX, SpaceListX[m])
-    SpaceY = np.append(SpaceY, SpaceListY[m])
-    
-ToothX = np.reshape(ToothX, (len(ToothX), 1))
-ToothY = np.reshape(ToothY, (len(ToothY), 1))    
-ZPoints = np.zeros((len(ToothX), 1), dtype = float)
-ZPoints = zcoord + ZPoints  
-
-ToothPoints = np.append(ToothX, ToothY, 1)
-ToothPoints = np.append(ToothPoints, ZPoints, 1)
-
-# np.savetxt("Tooth_PointsFile.asc", ToothPoints, delimiter = ",")
-
-SpaceX = np.reshape(SpaceX, (len(SpaceX), 1))
-SpaceY = np.reshape(SpaceY, (len(SpaceY), 1))    
-
-SpacePoints = np.append(SpaceX, SpaceY, 1)
-SpacePoints = np.append(SpacePoints, ZPoints, 1)
-
-# np.savetxt("SpaceWidth_PointsFile.asc", SpacePoints, delimiter = ",")
-
-# Full shaft and hub
-def arrange(parameter, ShapeValue):
-    NewArray = np.reshape(np.transpose(parameter), (z1 * ShapeValue, 1))
-    return NewArray
-
-ShaftListX = (arrange(x_inva1s, points), arrange(x_inva2s, points), arrange(xa1, points), arrange(x_fil1_s, points), arrange(x_fil2_s, points), arrange(xf1_1, points), arrange(xf1_2, points))
-ShaftListY = (arrange(y_inva1s, points), arrange(y_inva2s, points), arrange(ya1, points), arrange(y_fil1_s, points), arrange(y_fil2_s, points), arrange(yf1_1, points), arrange(yf1_2, points))
-HubListX = (arrange(x_inva1e, points), arrange(x_inva2e, points), arrange(xf2, points), arrange(xa2_1, points), arrange(xa2_2, points), arrange(x_fil1_e, points), arrange(x_fil2_e, points))
-HubListY = (arrange(y_inva1e, points), arrange(y_inva2e, points), arrange(yf2, points), arrange(ya2_1, points), arrange(ya2_2, points), arrange(y_fil1_e, points), arrange(y_fil2_e, points))
-
-ShaftX = []
-ShaftY = []
-HubX = []
-HubY = []
-for m in range(0, len(ShaftListX)):
-    ShaftX = np.append(ShaftX, ShaftListX[m])
-    ShaftY = np.append(ShaftY, ShaftListY[m])
-    HubX = np.append(HubX, HubListX[m])
-    HubY = np.append(HubY, HubListY[m])
-
-ShaftX = np.reshape(ShaftX, (len(ShaftX), 1))
-ShaftY = np.reshape(ShaftY, (len(ShaftY), 1))    
-ZPoints = np.zeros((len(ShaftX), 1), dtype = float)  
-ZPoints = zcoord + ZPoints  
-
-ShaftPoints = np.append(ShaftX, ShaftY, 1)
-ShaftPoints = np.append(ShaftPoints, ZPoints, 1)
-
-# np.savetxt("Shaft_PointsFile.asc", ShaftPoints, delimiter = ",") 
-
-HubX = np.reshape(HubX, (len(HubX), 1))
-HubY = np.reshape(HubY, (len(HubY), 1))    
-
-HubPoints = np.append(HubX, HubY, 1)
-HubPoints = np.append(HubPoints, ZPoints, 1)
-
-# np.savetxt("Hub_PointsFile.asc", HubPoints, delimiter = ",")   
-
-
-### DXF File Generation
-
-# Single Tooth and Single Space Width
-
-from ezdxf import units
-doc = ezdxf.new()
-doc.units = units.MM
-
-msp = doc.modelspace()
-column1 = 0
-column2 = points 
-for m in range(0, len(ToothListX)):
-    msp.add_polyline2d(ToothPoints[column1:column2]) 
-    column1 = column1 + points
-    column2 = column2 + points
-
-doc.saveas('Shaft_Tooth.dxf')
-
-from ezdxf import units
-doc = ezdxf.new()
-doc.units = units.MM
-
-msp = doc.modelspace()
-column1 = 0
-column2 = points 
-for m in range(0, len(SpaceListX)):
-    msp.add_polyline2d(SpacePoints[column1:column2]) 
-    column1 = column1 + points
-    column2 = column2 + points
-
-doc.saveas('Space_Width.dxf')
-
-# Entire Spline
-from ezdxf import units
-doc = ezdxf.new()
-doc.units = units.MM
-
-msp = doc.modelspace()
-column1 = 0
-column2 = points 
-for m in range(0, z1* len(ShaftListX)):
-    msp.add_polyline2d(ShaftPoints[column1:column2]) 
-    column1 = column1 + points
-    column2 = column2 + points
-
-doc.saveas('Shaft.dxf')
-
-
-doc = ezdxf.new()
-doc.units = units.MM
-
-msp = doc.modelspace()
-column1 = 0
-column2 = points 
-for m in range(0, z1* len(HubListX)):
-    msp.add_polyline2d(HubPoints[column1:column2]) 
-    column1 = column1 + points
-    column2 = column2 + points
-
-doc.saveas('Hub.dxf')
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Dec  4 01:34:02 2021
+
+@author: 2018
+"""
+
+# This is a gear generator that creates internal (hub) and external (shaft)
+# flank-centered gears in accordance with DIN 5480-1, Mar 2006.
+
+# The designation for these gears is:
+    # Reference Diameter(dB) x Module(m) x Number of teeth(z1) x Tolerance Grade Number, Deviation Letter
+    # Ex: 30 x 1 x 28 x 8j
+    # All lengths are in mm and angles are in radians unless otherwise specified.
+
+# To generate DXF files of the gear you'd like, simply run the code and input
+# the parameters in your gear's designation. DXF files of an external spline and
+# internal spline will be generated along with files of a single tooth of the
+# external spline and a single space width of the internal spline.
+
+# DXF files can be imported into most CAD softwares. Once imported, just highlight the 2D profile
+# and extrude to create a 3D gear. DXF files can also be used to cut the 2D profile into a 3D stock
+# of material on most EDMs.
+
+# The script can also be imported as a module. generate() runs the whole calculation for one
+# designation and returns every gear parameter and both profiles (GearProfile) in a dictionary. Every stage
+# of that calculation is memoized (see "Dependency-Tracked Evaluation" below), so changing only
+# one input of a designation reuses all the stages that don't depend on it.
+
+# IMPORTANT: If you import a points file, the CAD software settings must be in mm.
+# IMPORTANT: The DXF file won't generate if you don't have the ezdxf python library installed
+
+import functools
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+import ezdxf
+from ezdxf import units
+
+points = 10 # Must be a whole number. Determines the number of points generated per spline. A higher number is more accurate, but harder on CAD software.
+zcoord = 0 # This defines how far from the X-Y plane that the 2D involute profile will be
+
+alpha = np.pi / 6 # Pressure angle. For all DIN 5480 gears, this is 30 degrees or pi/6 radians
+
+### Dependency-Tracked Evaluation
+    # The gear is built in stages: parameters -> tolerances -> flank angles -> segments -> exports.
+    # The segments stages pack the whole contour of the shaft or hub into a GearProfile.
+    # Each stage below is decorated with @stage, which memoizes it on the exact values that are passed
+    # to it. Stages only take the values they actually use, so when one input of a designation changes
+    # (a deviation letter for example) only the stages downstream of that input are recomputed.
+    # Each stage keeps only its stage_size most recently used results, so batches of thousands of
+    # designations don't keep every profile alive.
+
+stage_size = 16 # Number of results kept by each stage
+stage_counts = {} # Number of times each stage has actually been computed (cache misses), by stage name
+stage_caches = {} # Memoized results of each stage, by stage name, least recently used first
+
+def stage(func):
+    name = func.__name__
+    cache = stage_caches.setdefault(name, OrderedDict())
+    stage_counts.setdefault(name, 0)
+
+    @functools.wraps(func)
+    def evaluate(*args):
+        if args in cache:
+            cache.move_to_end(args)
+            return cache[args]
+        stage_counts[name] += 1
+        result = cache[args] = func(*args)
+        if len(cache) > stage_size:
+            cache.popitem(last = False)
+        return result
+    return evaluate
+
+# Below is a function that empties every stage cache and resets the recompute counts
+def clear_stages():
+    for name in stage_caches:
+        stage_caches[name].clear()
+        stage_counts[name] = 0
+
+### Gear Parameter Calculations
+    # This section calculates all the required parameters necessary to build the gear from
+    # the provided parameters
+
+def machining_coefs(MachMethod): # This establishes the dedendum and form clearance coefficients
+    if MachMethod == "broaching":
+        hfp_coef = 0.55
+        cFP_coef = 0.02
+    elif MachMethod == "hobbing":
+        hfp_coef = 0.6
+        cFP_coef = 0.07
+    elif MachMethod == "gear shaping":
+        hfp_coef = 0.65
+        cFP_coef = 0.12
+    elif MachMethod == "cold rolling":
+        hfp_coef = 0.84
+        cFP_coef = 0.12
+    else:
+        raise ValueError("Maching method input is invalid. Must be broaching, hobbing, gear shaping, or cold rolling.")
+    return hfp_coef, cFP_coef
+
+def fillet_coef(FilletMethod): # This establishes the fillet root radius coefficient
+    if FilletMethod == "chip-removal" or FilletMethod == "chip-removal machining":
+        rho_coef = 0.16
+    elif FilletMethod == "cold rolling":
+        rho_coef = 0.54
+    else:
+        raise ValueError("Fillet creation method input is invalid. Must be chip-removal or cold rolling")
+    return rho_coef
+
+# Table 4 from 5480-1. Used to determine minimum form clearance (cFmin)
+tab4 = np.zeros([7,3], dtype = float)
+tab4[:, 0] = [25, 28, 30, 35, 40, None, None]
+tab4[:, 1] = [None, 30, 35, 40, 45, 50, None]
+tab4[:, 2] = [None, None, 40, 45, 50, 55, 65]
+tab4 = tab4 * 0.001 # Converts values in the table from microns to mm
+
+# The following two functions determine the column and row of the cFmin in table 4
+def tab4col(mod):
+    if mod >= 0.5 and mod <= 1.5:
+        tab4_col = 0
+    elif mod >= 1.75 and mod <= 4:
+        tab4_col = 1
+    elif mod >= 5 and mod <= 10:
+        tab4_col = 2
+    else:
+        raise ValueError("invalid input for Module. Must be 0.5-1.5, 1.75-4, or 5-10")
+    return tab4_col
+
+def tab4row(dB):
+    if dB - round(dB) != 0:
+        raise ValueError("Invalid input for Reference Diameter. Must be a whole number")
+    elif dB > 0 and dB <= 12:
+        tab4_row = 0
+    elif dB > 12 and dB <= 25:
+        tab4_row = 1
+    elif dB > 25 and dB <= 50:
+        tab4_row = 2
+    elif dB > 50 and dB <= 100:
+        tab4_row = 3
+    elif dB > 100 and dB <= 200:
+        tab4_row = 4
+    elif dB > 200 and dB <= 400:
+        tab4_row = 5
+    elif dB > 400:
+        tab4_row = 6
+    else:
+        raise ValueError("Invalid input for Reference Diameter, see table 1 in DIN 5480-1 for preferred values")
+    return tab4_row
+
+def profile_shift(dB, mod, z1): # Profile shift modification value for the shaft
+    return (dB / mod - z1 - 1.1) / 2
+
+@stage
+def parameters(dB, mod, z1, MachMethod, FilletMethod):
+    hfp_coef, cFP_coef = machining_coefs(MachMethod)
+    rho_coef = fillet_coef(FilletMethod)
+    cFmin = tab4[tab4row(dB), tab4col(mod)]
+
+    pitch = mod * np.pi # Pitch value
+    z2 = -z1 # Teeth value representation for the hub
+    x1 = profile_shift(dB, mod, z1) # Profile shift modification value for the shaft
+    x2 = -x1 # Profile shift modification value for the hub
+    hap = x1 * mod # Addendum
+    hfp = hfp_coef * mod # Dedendum
+    hP = hap + hfp # Tooth height
+    cP = hfp - hap # Bottom clearance
+    rho = rho_coef * mod # Root fillet radius
+    dp = mod*z1 # Pitch diameter
+    db = mod* z1 * np.cos(alpha) # Base diameter. This is what the involute profile is drawn from
+
+    da2 = abs(mod * (z2 + 2 * x2 + 0.9)) # Hub tip diameter
+    df2 = abs(mod * z2 + 2 * x2 * mod - 2 * hfp) # Hub root diameter
+
+    da1 = mod * (z1 + 2 * x1 + 0.9) # Shaft tip diameter
+    df1 = mod * z1 + 2 * x1 * mod - 2 * hfp # Shaft root diameter
+    dFf1 = da2 - 2 * cFmin # Shaft form circle diameter
+    dFf2 = da1 + 2 * cFmin # Hub form circle diameter
+
+    cFP = mod * cFP_coef
+
+    return {"cFmin": cFmin, "pitch": pitch, "z2": z2, "x1": x1, "x2": x2, "hap": hap, "hfp": hfp,
+            "hP": hP, "cP": cP, "rho": rho, "dp": dp, "db": db, "da1": da1, "df1": df1, "dFf1": dFf1,
+            "da2": da2, "df2": df2, "dFf2": dFf2, "cFP": cFP,
+            "rb": db / 2, # Radius of base circle.
+            "rp": dp / 2, # Pitch radius
+            "ra1": da1 / 2, # Shaft tip radius
+            "rf1": df1 / 2, # Shaft root radius
+            "rFf1": dFf1 / 2, # Shaft form circle radius
+            "ra2": da2 / 2, # Hub tip radius
+            "rf2": df2 / 2, # Hub root radius
+            "rFf2": dFf2 / 2, # Hub form circle radius
+            "p_sector": 2*np.pi / z1} # Central angle of one pitch
+
+### Tooth thickness and space width values and tolerances calculations
+ # This section creates tables necessary for finding the shaft tooth thickness (s1)
+ # and hub space width (e2) values and calculates those values and their associated
+ # tolerances based on the inputted tolerance grade and deviation grade.
+
+# The following is the first section of Table 7, which holds deviation space width (Ae) and
+# deviation tooth thickness (As) values
+tab71 = np.zeros([18, 9], dtype = float)
+tab71[0, :] = [200, 180, 160, 140, 125, 110, 100, 90, 80]
+tab71[1, :] = [180, 162, 144, 126, 112, 99, 90, 81, 72]
+tab71[2, :] = [160, 144, 128, 112, 100, 88, 80, 72, 64]
+tab71[3, :] = [140, 126, 112, 98, 88, 77, 70, 63, 56]
+tab71[4, :] = [120, 108, 96, 84, 75, 66, 60, 54, 48]
+tab71[5, :] = [100, 90, 80, 70, 62, 55, 50, 45, 40]
+tab71[6, :] = [80, 72, 64, 56, 50, 44, 40, 36, 32]
+tab71[7, :] = [60, 54, 48, 42, 37, 33, 30, 27, 24]
+tab71[8, :] = [40, 36, 32, 28, 25, 22, 20, 18, 16]
+tab71[9, :] = [20, 18, 16, 14, 12, 11, 10, 9, 8]
+tab71[11, :] = -tab71[9, :]
+tab71[12, :] = -tab71[8, :]
+tab71[13, :] = -tab71[7, :]
+tab71[14, :] = -tab71[6, :]
+tab71[15, :] = -tab71[4, :]
+tab71[16, :] = -tab71[2, :]
+tab71[17, :] = -tab71[0, :]
+tab71 = tab71 * 0.001 # Converts table values from microns to mm
+
+# The following is the second section of Table 7, which provides actual and effective
+# tolerance values for Ae and As
+tab72 = np.zeros([30, 3], dtype = float)
+tab72[:, 0] = [12, 14, 16, 18, 20, 22, 25, 28, 32, 36, 40, 45, 50, 56, 63, 71, 80, 90, 100, 112, 125, 140, 160, 180, 200, 224, 250, 280, 320, 360]
+tab72[:, 1] = [8, 9, 10, 11, 12, 14, 16, 18, 20, 22, 25, 28, 32, 36, 40, 45, 50, 56, 63, 71, 80, 90, 100, 112, 125, 140, 160, 175, 200, 225]
+tab72[:, 2] = [4, 5, 6, 7, 8, 8, 9, 10, 12, 14, 15, 17, 18, 20, 23, 26, 30, 34, 37, 41, 45, 50, 60, 68, 75, 84, 90, 105, 120, 135]
+tab72 = tab72 * 0.001 # Converts table values from microns to mm
+
+# The following function determines the column that Ae and As are on in Table 7
+def tab71col(dB, mod):
+    tab4_row = tab4row(dB)
+    tab4_col = tab4col(mod)
+    # Each reference diameter row of table 4 starts one column further to the left in table 7, and
+    # each module range moves one more column to the left
+    return 8 - tab4_row - tab4_col
+
+def tab71row(deviation_letter):
+    if deviation_letter == "v":
+        tab71_row = 0
+    elif deviation_letter == "u":
+        tab71_row = 1
+    elif deviation_letter == "t":
+        tab71_row = 2
+    elif deviation_letter == "s":
+        tab71_row = 3
+    elif deviation_letter == "r":
+        tab71_row = 4
+    elif deviation_letter == "p":
+        tab71_row = 5
+    elif deviation_letter == "n":
+        tab71_row = 6
+    elif deviation_letter == "m":
+        tab71_row = 7
+    elif deviation_letter == "k" or deviation_letter == "F":
+        tab71_row = 8
+    elif deviation_letter == "j" or deviation_letter == "G":
+        tab71_row = 9
+    elif deviation_letter == "h" or deviation_letter == "H":
+        tab71_row = 10
+    elif deviation_letter == "g" or deviation_letter == "J":
+        tab71_row = 11
+    elif deviation_letter == "f" or deviation_letter == "K":
+        tab71_row = 12
+    elif deviation_letter == "e" or deviation_letter == "M":
+        tab71_row = 13
+    elif deviation_letter == "d":
+        tab71_row = 14
+    elif deviation_letter == "c":
+        tab71_row = 15
+    elif deviation_letter == "b":
+        tab71_row = 16
+    elif deviation_letter == "a":
+        tab71_row = 17
+    else:
+        raise ValueError("Invalid deviation letter input, see table 9 for recommendations based on fit types.")
+    return tab71_row
+
+# The following function determines the row that the space width and tooth thickness deviations are
+# on in Table 7. Every tolerance grade moves three rows down the table, and every column of table 7
+# to the left moves one row down.
+def tab72row(tolerance_grade, tab71_col):
+    if tolerance_grade - round(tolerance_grade) != 0:
+        raise ValueError("Tolerance Grade Number input is invalid. Must be a whole number.")
+    elif tolerance_grade < 5 or tolerance_grade > 12:
+        raise ValueError("Tolerance Grade Number input is invalid. Must be 5-12")
+    return int(3 * (tolerance_grade - 5) + (8 - tab71_col))
+
+@stage
+def tolerances(dB, mod, z1, TolGrade, DevLetter, side):
+    tab71_col = tab71col(dB, mod)
+    A = tab71[tab71row(DevLetter), tab71_col] # Space width or tooth thickness deviation
+    T_act = tab72[tab72row(TolGrade, tab71_col), 1] # Actual tolerance
+    T_eff = tab72[tab72row(TolGrade, tab71_col), 2] # Effective tolerance
+
+    x1 = profile_shift(dB, mod, z1)
+    s1 = mod * np.pi / 2 + 2 * x1 * mod * np.tan(alpha) # Circular tooth thickness of the shaft measured on the pitch diameter
+
+    if side == "shaft":
+        s_vmax = s1 + A # Max effective tolerance
+        s_max = s1 + A - T_eff # Max actual reference tolerance
+        s_min = s1 + A - T_act - T_eff # Min actual tolerance
+        s = s_min + (s_max - s_min) / 2 # Arbitrary nominal value that lies in the middle of the tolerance
+        return {"As": A, "T_act_s": T_act, "T_eff_s": T_eff, "s1": s1,
+                "s_vmax": s_vmax, "s_max": s_max, "s_min": s_min, "s": s}
+    else:
+        e2 = s1 # Circular space width of the hub measured on the pitch diameter
+        e_max = e2 + A + T_act + T_eff # Max actual tolerance
+        e_min = e2 + A + T_eff # Min actual reference tolerance
+        e_vmin = e2 + A # Min effective tolerance
+        e = e_min + (e_max - e_min) / 2 # Arbitrary nominal value that lies in the middle of the tolerance
+        return {"Ae": A, "T_act_e": T_act, "T_eff_e": T_eff, "e2": e2,
+                "e_max": e_max, "e_min": e_min, "e_vmin": e_vmin, "e": e}
+
+### Spline Generation Calculations:
+
+# Shaft Involute Sides:
+def inv(theta): # Involute function of an angle
+    inv_angle = np.tan(theta) - theta
+    return inv_angle
+
+def invr(radius, rb): # Involute angle outputted for a given radius relative to the base circle radius
+    angle = np.arccos(rb/radius)
+    inv_angle = inv(angle)
+    return inv_angle
+
+def pitch_angles(z1): # Polar angle at the start of each pitch in the gear profile
+    p_sector = 2*np.pi / z1
+    return np.linspace(0, 2*np.pi - p_sector, z1)
+
+# Below is a function that will return the involute profile x and y coordinates of one tooth side for every tooth
+# in the gear
+def invcoord(RadRange, InvAng, sector_range):
+    x_inva = []
+    y_inva = []
+    for angle in sector_range:
+        x_inva.append(RadRange * np.cos(InvAng + angle))
+        y_inva.append(RadRange * np.sin(InvAng + angle))
+    x_inva = np.transpose(np.array(x_inva))
+    y_inva = np.transpose(np.array(y_inva))
+    return x_inva, y_inva
+
+# Below is a function that returns the radii and polar angles along both involute sides of the first
+# tooth (shaft) or space width (hub). The first involute profile is centered on the x axis with the
+# given circular width on the pitch circle.
+@stage
+def flank_angles(rb, rp, RadStart, RadEnd, width, points):
+    sector = width / rp # Central angle encompassing one tooth thickness or space width
+    inva_tooth = invr(rp, rb) # Polar angle to the involute profile on the pitch circle
+
+    RadRange = np.linspace(RadStart, RadEnd, points) # Range of radii along the involute profile
+    inva1 = invr(RadRange, rb) # Range of involute angles along the side profile
+    inva_sector = 2 * (inva_tooth - inva1[0]) + sector # Central angle between the base of two involute profiles
+    inva1 = inva1 - inva1[0] - inva_sector/2 # Centers the first tooth or space width along the x axis
+    inva2 = -inva1
+    return RadRange, inva1, inva2
+
+# Shaft Tooth Tip Generation
+
+# Below is a function that generates tooth tip or root circle coordinates
+def ArcCoord(TipRadius, AngRang, sector_range):
+    xa = []
+    ya = []
+    for angle in sector_range:
+        xa.append(TipRadius * np.cos(AngRang + angle))
+        ya.append(TipRadius * np.sin(AngRang + angle))
+    xa = np.transpose(np.array(xa))
+    ya = np.transpose(np.array(ya))
+    return xa, ya
+
+# Shaft Root Fillet Generation:
+
+# Below is a function that generates the coordinates for the root fillet of one side of a gear tooth
+def fillet(FormRad, RootRad, InvAng, rho, sector_range, points):
+    if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
+        H = (RootRad + rho) * np.cos(InvAng) # X coordinate of the center of the root fillet circle on shaft
+        K = (RootRad + rho) * np.sin(InvAng) # Y coordinate of the center of the root fillet circle on shaft
+    else: # Defining parameters for root fillet circle on the hub
+        H = (RootRad - rho) * np.cos(InvAng) # X coordinate of the center of the root fillet circle on hub
+        K = (RootRad - rho) * np.sin(InvAng) # Y coordinate of the center of the root fillet circle on hub
+
+    aq = (K**2 / H**2) + 1 # "a" term of the quadratic equation
+    bq = -(K / H**2) * (FormRad**2 - rho**2 + K**2 - H**2) - 2 * K # "b" term of the quadratic equation
+    cq = ((FormRad**2 - rho**2 + K**2 - H**2) / (2 * H))**2 + K**2- rho**2 # "c" term of the quadratic equation
+
+    y_int = (-bq + (bq**2 - 4 * aq * cq)**0.5) / (2 * aq) # Quadratic formula solving for y coordinate of root fillet circle and form circle intercept
+    x_int = (FormRad**2 - y_int**2)**0.5 # x coordinate of root fillet circle and form circle intercept
+
+    theta_int_Ff = np.arccos(x_int / FormRad) # Polar angle to fillet circle and form circle intercept from form circle center
+
+    if FormRad > RootRad:
+        thetaHK = theta_int_Ff
+    else:
+        thetaHK = InvAng - (theta_int_Ff - InvAng)
+
+    # Now that thetaHK has been redefined, the lines of code solving for the intercept must be repeated to update the intercept point
+    if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
+        H = (RootRad + rho) * np.cos(thetaHK) # X coordinate of the center of the root fillet circle on shaft
+        K = (RootRad + rho) * np.sin(thetaHK) # Y coordinate of the center of the root fillet circle on shaft
+    else: # Defining parameters for root fillet circle on the hub
+        H = (RootRad - rho) * np.cos(thetaHK) # X coordinate of the center of the root fillet circle on hub
+        K = (RootRad - rho) * np.sin(thetaHK) # Y coordinate of the center of the root fillet circle on hub
+
+    aq = (K**2 / H**2) + 1 # "a" term of the quadratic equation
+    bq = -(K / H**2) * (FormRad**2 - rho**2 + K**2 - H**2) - 2 * K # "b" term of the quadratic equation
+    cq = ((FormRad**2 - rho**2 + K**2 - H**2) / (2 * H))**2 + K**2- rho**2 # "c" term of the quadratic equation
+
+    y_int = (-bq + (bq**2 - 4 * aq * cq)**0.5) / (2 * aq) # Quadratic formula solving for y coordinate of root fillet circle and form circle intercept
+    x_int = (FormRad**2 - y_int**2)**0.5 # x coordinate of root fillet circle and form circle intercept
+    theta_int_fillet = np.arccos((x_int - H) / rho) # Polar angle to fillet circle and form circle intercept on the fillet circle center
+
+    def fillet2(thetaHK, theta_int_fillet, offset):
+        x_fil = []
+        y_fil = []
+        for angle in sector_range:
+            if FormRad > RootRad: # Defining parameters for root fillet circle on the shaft
+                H = (RootRad + rho) * np.cos(thetaHK + angle) # X coordinate of the center of the root fillet circle on shaft
+                K = (RootRad + rho) * np.sin(thetaHK + angle) # Y coordinate of the center of the root fillet circle on shaft
+                FilletAngRang = np.linspace(thetaHK + offset + angle, (thetaHK + offset) + ((thetaHK + offset) - theta_int_fillet) + angle, points)
+            else: # Defining parameters for root fillet circle on the hub
+                H = (RootRad - rho) * np.cos(thetaHK + angle) # X coordinate of the center of the root fillet circle on hub
+                K = (RootRad - rho) * np.sin(thetaHK + angle) # Y coordinate of the center of the root fillet circle on hub
+                FilletAngRang = np.linspace(thetaHK + angle, theta_int_fillet + angle, points)
+            x_fil.append(H + rho * np.cos(FilletAngRang))
+            y_fil.append(K + rho * np.sin(FilletAngRang))
+
+        x_fil = np.transpose(np.array(x_fil)) # X coordinates of root fillets on one side of the tooth
+        y_fil = np.transpose(np.array(y_fil)) # Y coordinates of root fillets on one side of the tooth
+        return x_fil, y_fil
+
+    x_fil1, y_fil1 = fillet2(thetaHK, theta_int_fillet, np.pi)
+    x_fil2, y_fil2 = fillet2(-thetaHK, -theta_int_fillet, -np.pi)
+
+    return x_fil1, y_fil1, x_fil2, y_fil2, thetaHK
+
+### Gear Profile
+    # Every profile (the shaft or the hub) is stored in one GearProfile object. All the points of the
+    # profile are in one contiguous (n, 2) coordinate buffer, and a small segment table tells which
+    # rows of the buffer belong to which tooth and which type of segment. The exporters, plots and
+    # analyses read the profile from that buffer.
+
+FLANK_L = 0 # Involute flank on the negative polar angle side of a tooth or space width (inva1)
+FLANK_R = 1 # Involute flank on the positive polar angle side (inva2)
+TIP = 2 # Tip circle
+FILLET_L = 3 # Root fillet on the negative polar angle side
+FILLET_R = 4 # Root fillet on the positive polar angle side
+ROOT = 5 # Root circle
+
+segment_dtype = np.dtype([("tooth", np.int32), # Tooth (shaft) or space width (hub) number, starting at 0
+                          ("type", np.int8), # One of the segment types above
+                          ("slot", np.int8), # Position of the segment when a single tooth is drawn
+                          ("start", np.int64), # First row of the segment in the coordinate buffer
+                          ("count", np.int32)]) # Number of points in the segment
+
+class GearProfile:
+    __slots__ = ("side", "z1", "thetaHK", "coords", "segments")
+
+    def __init__(self, side, z1, thetaHK, coords, segments):
+        self.side = side # "shaft" or "hub"
+        self.z1 = z1 # Number of teeth
+        self.thetaHK = thetaHK # Polar angle of the center of the positive side root fillet of the first tooth
+        self.coords = coords # (n, 2) buffer of x and y coordinates
+        self.segments = segments # Segment table (segment_dtype), in the order of the buffer
+
+    def __len__(self):
+        return len(self.segments)
+
+    @property
+    def nbytes(self):
+        return self.coords.nbytes + self.segments.nbytes
+
+    def polyline(self, row): # Coordinates of one segment of the table, as a view of the buffer
+        start = self.segments["start"][row]
+        return self.coords[start:start + self.segments["count"][row]]
+
+    def polylines(self, rows = None): # Coordinates of several segments (every segment by default)
+        if rows is None:
+            rows = range(len(self.segments))
+        return [self.polyline(row) for row in rows]
+
+    def tooth(self, k = 0): # Rows of the segments of one tooth, in the order they are drawn
+        rows = np.flatnonzero(self.segments["tooth"] == k)
+        return rows[np.argsort(self.segments["slot"][rows], kind = "stable")]
+
+    def of_type(self, seg_type): # Rows of every segment of one type
+        return np.flatnonzero(self.segments["type"] == seg_type)
+
+    def points_array(self, rows = None): # (n, 3) points array of several segments, like a points file
+        XY = self.coords if rows is None else np.concatenate(self.polylines(rows))
+        return np.column_stack((XY, np.zeros(len(XY)) + zcoord))
+
+# Below is a function that packs the segments of a profile into a GearProfile. Segments is a list of
+# (type, x, y) with the x and y arrays shaped (points, z1) like the outputs of invcoord, listed in the
+# order they are drawn for a single tooth. Order is the order of the segments in the buffer.
+def pack_profile(side, z1, thetaHK, segments, order):
+    points = segments[0][1].shape[0]
+    coords = np.empty((len(segments) * z1 * points, 2))
+    table = np.zeros(len(segments) * z1, dtype = segment_dtype)
+    for j, slot in enumerate(order):
+        seg_type, x, y = segments[slot]
+        block = coords[j * z1 * points:(j + 1) * z1 * points].reshape(z1, points, 2)
+        block[:, :, 0] = x.T
+        block[:, :, 1] = y.T
+        rows = table[j * z1:(j + 1) * z1]
+        rows["tooth"] = np.arange(z1)
+        rows["type"] = seg_type
+        rows["slot"] = slot
+        rows["start"] = (j * z1 + np.arange(z1)) * points
+        rows["count"] = points
+    return GearProfile(side, z1, thetaHK, coords, table)
+
+# Below is a function that chains the segments of a profile into one closed cut path. The segments of
+# one tooth are chained by matching their end points, starting at the end point at -p_sector/2, and
+# every tooth is chained the same way since they are rotated copies of the first one.
+def cut_path(profile):
+    rows = profile.tooth(0)
+    ends = np.array([[line[0], line[-1]] for line in profile.polylines(rows)]) # (segment, end, xy)
+    angles = np.arctan2(ends[:, :, 1], ends[:, :, 0])
+    first = np.unravel_index(np.argmin(angles), angles.shape)
+    chain = [(first[0], first[1] == 1)] # (segment, reversed)
+    current = ends[first[0], 1 - first[1]]
+    left = set(range(len(rows))) - {first[0]}
+    while left:
+        candidates = sorted(left)
+        dist = np.hypot(*(ends[candidates] - current).transpose(2, 0, 1)) # (candidate, end)
+        k, end = np.unravel_index(np.argmin(dist), dist.shape)
+        chain.append((candidates[k], end == 1))
+        current = ends[candidates[k], 1 - end]
+        left.remove(candidates[k])
+
+    lines = []
+    for k in range(profile.z1):
+        tooth_rows = profile.tooth(k)
+        for slot, backward in chain:
+            line = profile.polyline(tooth_rows[slot])
+            lines.append(line[::-1] if backward else line)
+    path = np.concatenate(lines)
+    step = np.hypot(*np.diff(path, axis = 0).T)
+    keep = np.append(True, step > 1e-9 * (1 + np.abs(path[1:]).max(axis = 1))) # Removes the repeated end points
+    path = path[keep]
+    if np.hypot(*(path[-1] - path[0])) <= 1e-9 * (1 + np.abs(path[0]).max()):
+        path = path[:-1]
+    return path
+
+# Below is a function that generates every segment of the shaft profile for the first teeth (every
+# tooth by default): both involute sides, the tooth tip, both root fillets and both halves of the root
+# circle. The first tooth is the same whatever the number of teeth generated.
+def shaft_profile(rb, rp, rFf1, ra1, rf1, rho, s, z1, points, teeth = None):
+    sector_range = pitch_angles(z1)[:teeth]
+    p_sector = 2*np.pi / z1
+
+    RadRange_s, inva1s, inva2s = flank_angles(rb, rp, rFf1, ra1, s, points)
+    x_inva1s, y_inva1s = invcoord(RadRange_s, inva1s, sector_range) # Coordinates for first side of involute profile
+    x_inva2s, y_inva2s = invcoord(RadRange_s, inva2s, sector_range) # Coordinates for second side of involute profile
+
+    ra1_AngRang = np.linspace(inva1s[-1], inva2s[-1], points) # Range of polar angles along one tooth tip
+    xa1, ya1 = ArcCoord(ra1, ra1_AngRang, sector_range) # Coordinates for points along a tooth tip
+
+    x_fil1_s, y_fil1_s, x_fil2_s, y_fil2_s, thetaHK = fillet(rFf1, rf1, inva2s[0], rho, sector_range, points) # Shaft root fillet coordinates
+
+    # Shaft Root Circle Generation:
+    rf1_AngRang1 = np.linspace(p_sector/2, thetaHK, points)
+    xf1_1, yf1_1 = ArcCoord(rf1, rf1_AngRang1, sector_range)
+    rf1_AngRang2 = -rf1_AngRang1
+    xf1_2, yf1_2 = ArcCoord(rf1, rf1_AngRang2, sector_range)
+
+    segments = [(FLANK_L, x_inva1s, y_inva1s), (FLANK_R, x_inva2s, y_inva2s), (TIP, xa1, ya1),
+                (FILLET_R, x_fil1_s, y_fil1_s), (FILLET_L, x_fil2_s, y_fil2_s), (ROOT, xf1_1, yf1_1), (ROOT, xf1_2, yf1_2)]
+    return pack_profile("shaft", len(sector_range), thetaHK, segments, [0, 1, 2, 3, 4, 5, 6])
+
+@stage
+def shaft_segments(rb, rp, rFf1, ra1, rf1, rho, s, z1, points):
+    return shaft_profile(rb, rp, rFf1, ra1, rf1, rho, s, z1, points)
+
+# Below is a function that generates every segment of the hub profile for the first space widths
+# (every space width by default): both involute sides, both halves of the hub tooth tip, both root
+# fillets and the root circle
+def hub_profile(rb, rp, ra2, rFf2, rf2, rho, e, z1, points, teeth = None):
+    sector_range = pitch_angles(z1)[:teeth]
+    p_sector = 2*np.pi / z1
+
+    # Hub Involute Sides:
+    RadRange_e, inva1e, inva2e = flank_angles(rb, rp, ra2, rFf2, e, points)
+    x_inva1e, y_inva1e = invcoord(RadRange_e, inva1e, sector_range) # Coordinates for first side of involute profile
+    x_inva2e, y_inva2e = invcoord(RadRange_e, inva2e, sector_range) # Coordinates for second side of involute profile
+
+    # Hub Tooth Tip Generation
+    ra2_AngRang1 = np.linspace(inva2e[0], p_sector / 2, points) # Range of polar angles along half of a hub tooth tip
+    xa2_1, ya2_1 = ArcCoord(ra2, ra2_AngRang1, sector_range) # Coordinates for points along half a hub tooth tip
+    ra2_AngRang2 = -ra2_AngRang1 # Range of polar angles along another half of a hub tooth tip
+    xa2_2, ya2_2 = ArcCoord(ra2, ra2_AngRang2, sector_range) # Coordinates for points along half a hub tooth tip
+
+    # Hub Root Fillet Generation:
+    x_fil1_e, y_fil1_e, x_fil2_e, y_fil2_e, thetaHK = fillet(rFf2, rf2, inva2e[-1], rho, sector_range, points) # Hub root fillet coordinates
+
+    # Hub Root Circle Generation:
+    rf2_AngRang = np.linspace(thetaHK, -thetaHK, points)
+    xf2, yf2 = ArcCoord(rf2, rf2_AngRang, sector_range)
+
+    segments = [(FLANK_L, x_inva1e, y_inva1e), (FLANK_R, x_inva2e, y_inva2e), (TIP, xa2_1, ya2_1), (TIP, xa2_2, ya2_2),
+                (FILLET_R, x_fil1_e, y_fil1_e), (FILLET_L, x_fil2_e, y_fil2_e), (ROOT, xf2, yf2)]
+    return pack_profile("hub", len(sector_range), thetaHK, segments, [0, 1, 6, 2, 3, 4, 5]) # The entire hub has the root circle third
+
+@stage
+def hub_segments(rb, rp, ra2, rFf2, rf2, rho, e, z1, points):
+    return hub_profile(rb, rp, ra2, rFf2, rf2, rho, e, z1, points)
+
+### Measurement Over Pins
+    # This section calculates the pin diameter and length of the measurement across pins when
+    # The are put on either side of the gear. This measurement can be used when performing
+    # quality assurance on the gear, to insure the involute sides are within their tolerances
+
+# Gauge pin diameters (mm) that mop_limits() chooses from. Replace them with the pins that are
+# available in the inspection room.
+gauge_pins = np.array([0.3, 0.35, 0.4, 0.45, 0.5, 0.6, 0.7, 0.8, 0.9, 1, 1.1, 1.2, 1.3, 1.4, 1.5, 1.6, 1.7, 1.8,
+                       1.9, 2, 2.25, 2.5, 2.75, 3, 3.25, 3.5, 3.75, 4, 4.25, 4.5, 4.75, 5, 5.25, 5.5, 6, 6.5, 7,
+                       7.5, 8, 9, 10, 10.5, 11, 12, 14, 15, 16, 18, 20, 22, 25])
+
+# Below is a function that computes the measurement over pins of pins with a diameter d_pin. z and x are
+# negative for a hub. It also returns the diameter where the pins touch the flanks, and the diameter
+# that the pins reach (outside of a shaft, inside of a hub). It works on single values and on arrays.
+def pin_geometry(z, x, mod, d_pin):
+    # inv_phi is the involute function of the angle phi at the center of the pins
+    inv_phi = d_pin/(z * mod * np.cos(alpha)) - np.pi / (2 * z) + inv(alpha) + 2 * x * np.tan(alpha) / z
+
+    # Below, phi and the for loop under it calculate the perform the inverse involute function on inv_phi in order to find the angle phi.
+    phi = 1.441 * inv_phi**(1 / 3) - 0.374 * inv_phi
+    for n in range(0, 5):
+        phi = phi + (inv_phi - inv(phi)) / (np.tan(phi))**2
+
+    # The pin diameter is always added: for a hub z is negative, so the absolute value below turns
+    # the sum into the measurement between pins.
+    even = z * mod * np.cos(alpha) / np.cos(phi) + d_pin
+    odd = z * mod * np.cos(alpha) / (np.cos(phi)) * np.cos((np.pi / 2) / z) + d_pin
+    MoP = np.abs(np.where(z % 2 == 0, even, odd))[()] # The if/else of the number of teeth, for arrays
+
+    # The pins touch the flanks on the normal through their center, which is tangent to the base circle
+    rb = np.abs(z) * mod * np.cos(alpha) / 2
+    d_contact = 2 * np.hypot(rb, rb * np.tan(phi) - np.sign(z) * d_pin / 2)
+    d_reach = 2 * rb / np.cos(phi) + np.sign(z) * d_pin
+    return MoP, d_contact, d_reach
+
+@stage
+def pins(z, x, mod):
+    eta = (np.pi/(2*z) - inv(alpha)) - 2*x*np.tan(alpha)/z
+    alpha_p = np.arccos(z * mod * np.cos(alpha) / ((z + 2 * x) * mod))
+    phi = np.tan(alpha_p) + eta
+    d_pin = z * mod * np.cos(alpha) * (inv(phi) + eta) # Ideal diameter of pins used to measure distance across the gear
+    d_pin = round(2 * d_pin) / 2 # Rounded diameter to the nearest 0.5 that a gauge pin could match
+    MoP = pin_geometry(z, x, mod, d_pin)[0]
+    return MoP, d_pin # MoP is the Measurement over Pins. d_pin is the practical diameter of the pins
+
+# Below is a function that returns the profile shift that gives a tooth thickness (shaft) or space
+# width (hub) on the pitch circle, like s1 in tolerances(). It is negative for a hub, like x2.
+def equivalent_shift(width, mod, side):
+    x = (width - mod * np.pi / 2) / (2 * mod * np.tan(alpha))
+    return np.where(np.asarray(side) == "hub", -x, x)
+
+# Below is a function that chooses the gauge pin of every row that touches the flanks closest to the
+# diameter (z + 2x) * m, which is where the ideal pin of pins() touches them. The pin must touch the
+# flanks between the form and tip circles and reach past the tip circle for every profile shift of
+# the row (x has one column per limit). Rows without a suitable pin get NaN.
+def best_pin(z, x, mod, dFf, da, pin_set = gauge_pins, block = 2048):
+    d_pin = np.full(len(z), np.nan)
+    pin_set = np.asarray(pin_set, dtype = float)
+    for start in range(0, len(z), block):
+        k = slice(start, start + block)
+        Z, X, M = z[k, None, None], x[k, None, :], mod[k, None, None]
+        with np.errstate(invalid = "ignore"):
+            _, d_contact, d_reach = pin_geometry(Z, X, M, pin_set[None, :, None])
+        low = np.minimum(dFf[k], da[k])[:, None, None]
+        high = np.maximum(dFf[k], da[k])[:, None, None]
+        reaches = np.where(Z > 0, d_reach > da[k, None, None], d_reach < da[k, None, None])
+        fits = np.all((d_contact >= low) & (d_contact <= high) & reaches, axis = 2) # (row, pin)
+        target = np.abs(Z[:, :, 0] + 2 * X.mean(axis = 2)) * M[:, :, 0]
+        miss = np.where(fits, np.abs(d_contact.mean(axis = 2) - target), np.inf)
+        best = np.argmin(miss, axis = 1)
+        found = np.isfinite(miss[np.arange(len(best)), best])
+        d_pin[k] = np.where(found, pin_set[best], np.nan)
+    return d_pin
+
+# Below is a function that turns tooth thickness (shaft) or space width (hub) limits into measurement
+# over pins limits. Every argument is one value per row (arrays of a whole catalogue work), except
+# widths, which has one column per limit (ex: s_min, s_max, s_vmax). dFf and da are the form and tip
+# diameters of the measured side. When d_pin is None, the best pin of pin_set is chosen for every row.
+# It returns {"d_pin", "MoP", "contact"} with the measurement and contact diameter of every limit.
+def mop_limits(z1, mod, widths, side, dFf, da, d_pin = None, pin_set = gauge_pins):
+    z1, mod, dFf, da = (np.atleast_1d(np.asarray(value, dtype = float)) for value in (z1, mod, dFf, da))
+    widths = np.asarray(widths, dtype = float).reshape(len(z1), -1)
+    side = np.broadcast_to(side, z1.shape)
+    z = np.where(side == "hub", -z1, z1)
+    x = equivalent_shift(widths, mod[:, None], side[:, None])
+    if d_pin is None:
+        d_pin = best_pin(z, x, mod, dFf, da, pin_set)
+    d_pin = np.broadcast_to(np.asarray(d_pin, dtype = float), z1.shape)
+    with np.errstate(invalid = "ignore"):
+        MoP, d_contact, _ = pin_geometry(z[:, None], x, mod[:, None], d_pin[:, None])
+    return {"d_pin": d_pin, "MoP": MoP, "contact": d_contact}
+
+# Tooth thickness and space width limits that mop_acceptance() turns into measurement over pins limits
+limit_keys = {"shaft": ("s_min", "s_max", "s_vmax"), "hub": ("e_min", "e_max", "e_vmin")}
+
+# Below is a function that returns the measurement over pins acceptance limits of a generated gear:
+# MoP_s_min, MoP_s_max, MoP_s_vmax, MoP_e_min, ... and the chosen pins d_pin_limits_shaft/hub
+def mop_acceptance(gear, pin_set = gauge_pins):
+    result = {}
+    for side, n in (("shaft", "1"), ("hub", "2")):
+        limits = mop_limits(gear["z1"], gear["mod"], [gear[key] for key in limit_keys[side]], side,
+                            gear["dFf" + n], gear["da" + n], pin_set = pin_set)
+        result["d_pin_limits_" + side] = limits["d_pin"][0]
+        for key, MoP in zip(limit_keys[side], limits["MoP"][0]):
+            result["MoP_" + key] = MoP
+    return result
+
+### DXF File Generation
+
+# Below is a function that writes segments of a profile to a DXF file as one polyline per segment
+def write_dxf(profile, rows, filename):
+    doc = ezdxf.new()
+    doc.units = units.MM
+
+    msp = doc.modelspace()
+    for polyline in profile.polylines(rows):
+        msp.add_polyline2d(polyline)
+
+    doc.saveas(filename)
+
+# DxfStream writes a DXF file straight from coordinate arrays without building an ezdxf document. It
+# only knows the few entities this program uses (polylines, arcs, circles and text on layers) and
+# writes no time stamps, so the same input always gives the same bytes. Polylines are R12 POLYLINE
+# entities (AC1009), or LWPOLYLINE entities (AC1015) with lwpolyline = True. Every layer must be given
+# when the file is opened, since the layer table comes before the entities. When an error stops the
+# writing inside a with block, the unfinished file is deleted instead of being closed with its end.
+
+# An R12 file can leave out the handles and everything but the layers. An AC1015 (R2000) file must have
+# a handle and an owner on every table, record, entity and object, the *Model_Space and *Paper_Space
+# block records with their blocks and layouts, and the root dictionary in the OBJECTS section. The
+# handles of that fixed structure are below, the layers and entities are numbered from first_handle.
+# $HANDSEED (the next free handle) is in the header, before the number of entities is known, so it is
+# written as seed_width zeros and filled in by close().
+
+dxf_float = "%r" # Shortest text that reads back as exactly the same float
+
+dxf_handles = {"LAYER": 0x1, "LTYPE": 0x2, "APPID": 0x3, "DIMSTYLE": 0x4, "STYLE": 0x5, "UCS": 0x6, "VIEW": 0x7,
+               "VPORT": 0x8, "BLOCK_RECORD": 0x9, "root": 0xA, "groups": 0xC, "layouts": 0xD, "plot_styles": 0x12,
+               "normal": 0x13, "model": 0x17, "model_layout": 0x1A, "paper": 0x1B, "paper_layout": 0x1E}
+first_handle = 0x30
+seed_width = 16 # Hex digits of a 64 bit handle
+
+dxf_r2000_classes = "".join("  0\nCLASS\n  1\n%s\n  2\n%s\n  3\nObjectDBX Classes\n 90\n0\n280\n0\n281\n0\n" % names for names in
+                            (("ACDBDICTIONARYWDFLT", "AcDbDictionaryWithDefault"), ("ACDBPLACEHOLDER", "AcDbPlaceHolder"), ("LAYOUT", "AcDbLayout")))
+
+def dxf_table(name, count, subclass = ""): # Head of a table of an AC1015 file
+    return "  0\nTABLE\n  2\n%s\n  5\n%X\n330\n0\n100\nAcDbSymbolTable\n 70\n%d\n%s" % (name, dxf_handles[name], count, subclass)
+
+def dxf_record(name, handle, subclass, code = 5): # Head of a table record of an AC1015 file
+    return "  0\n%s\n%3d\n%X\n330\n%X\n100\nAcDbSymbolTableRecord\n100\n%s\n" % (name, code, handle, dxf_handles[name], subclass)
+
+def dxf_layout(name, handle, block, flags, tab): # LAYOUT object of an AC1015 file, with the default plot settings
+    return ("  0\nLAYOUT\n  5\n%X\n330\n%X\n100\nAcDbPlotSettings\n  1\n\n  4\nA3\n  6\n\n 40\n7.5\n 41\n20.0\n 42\n7.5\n 43\n20.0\n"
+            " 44\n420.0\n 45\n297.0\n 46\n0.0\n 47\n0.0\n 48\n0.0\n 49\n0.0\n140\n0.0\n141\n0.0\n142\n1.0\n143\n1.0\n 70\n%d\n"
+            " 72\n1\n 73\n0\n 74\n5\n  7\n\n 75\n16\n 76\n0\n 77\n2\n 78\n300\n147\n1.0\n148\n0.0\n149\n0.0\n100\nAcDbLayout\n"
+            "  1\n%s\n 70\n1\n 71\n%d\n 10\n0.0\n 20\n0.0\n 11\n420.0\n 21\n297.0\n 12\n0.0\n 22\n0.0\n 32\n0.0\n 14\n1e+20\n"
+            " 24\n1e+20\n 34\n1e+20\n 15\n-1e+20\n 25\n-1e+20\n 35\n-1e+20\n146\n0.0\n 13\n0.0\n 23\n0.0\n 33\n0.0\n 16\n1.0\n"
+            " 26\n0.0\n 36\n0.0\n 17\n0.0\n 27\n1.0\n 37\n0.0\n 76\n1\n330\n%X\n"
+            % (handle, dxf_handles["layouts"], flags, name, tab, block))
+
+def dxf_dictionary(handle, owner, entries = ()): # DICTIONARY object of an AC1015 file
+    return ("  0\nDICTIONARY\n  5\n%X\n330\n%X\n100\nAcDbDictionary\n281\n1\n" % (handle, owner)
+            + "".join("  3\n%s\n350\n%X\n" % entry for entry in entries))
+
+class DxfStream:
+    __slots__ = ("file", "lwpolyline", "subclass", "handle", "seed")
+
+    def __init__(self, filename, layers = ("0",), lwpolyline = False):
+        self.file = open(filename, "w", encoding = "ascii", newline = "\n", buffering = 1 << 20)
+        self.lwpolyline = lwpolyline
+        self.subclass = lwpolyline # Subclass markers (group code 100), handles and owners are only used in AC1015 files
+        self.handle = first_handle
+        layers = list(dict.fromkeys(["0"] + list(layers)))
+        if not lwpolyline:
+            self.file.write("  0\nSECTION\n  2\nHEADER\n  9\n$ACADVER\n  1\nAC1009\n  9\n$INSUNITS\n 70\n4\n  0\nENDSEC\n") # $INSUNITS 4 is mm
+            self.file.write("  0\nSECTION\n  2\nTABLES\n  0\nTABLE\n  2\nLTYPE\n 70\n1\n"
+                            "  0\nLTYPE\n  2\nCONTINUOUS\n 70\n0\n  3\nSolid line\n 72\n65\n 73\n0\n 40\n0.0\n  0\nENDTAB\n"
+                            "  0\nTABLE\n  2\nLAYER\n 70\n%d\n" % len(layers))
+            for layer in layers:
+                self.file.write("  0\nLAYER\n  2\n%s\n 70\n0\n 62\n7\n  6\nCONTINUOUS\n" % layer)
+            self.file.write("  0\nENDTAB\n  0\nENDSEC\n  0\nSECTION\n  2\nENTITIES\n")
+            return
+
+        h = dxf_handles
+        write = self.file.write
+        write("  0\nSECTION\n  2\nHEADER\n  9\n$ACADVER\n  1\nAC1015\n  9\n$HANDSEED\n  5\n")
+        self.seed = self.file.tell() # Position of the $HANDSEED value
+        write("0" * seed_width + "\n  9\n$INSUNITS\n 70\n4\n  0\nENDSEC\n")
+        write("  0\nSECTION\n  2\nCLASSES\n" + dxf_r2000_classes + "  0\nENDSEC\n  0\nSECTION\n  2\nTABLES\n")
+        write(dxf_table("VPORT", 0) + "  0\nENDTAB\n")
+        write(dxf_table("LTYPE", 3))
+        for number, name in enumerate(("ByBlock", "ByLayer", "Continuous")):
+            write(dxf_record("LTYPE", 0x24 + number, "AcDbLinetypeTableRecord") + "  2\n%s\n 70\n0\n  3\n\n 72\n65\n 73\n0\n 40\n0.0\n" % name)
+        write("  0\nENDTAB\n" + dxf_table("LAYER", len(layers)))
+        for layer in layers:
+            write(dxf_record("LAYER", self.next_handle(), "AcDbLayerTableRecord")
+                  + "  2\n%s\n 70\n0\n 62\n7\n  6\nContinuous\n370\n-3\n390\n%X\n" % (layer, h["normal"]))
+        write("  0\nENDTAB\n" + dxf_table("STYLE", 1) + dxf_record("STYLE", 0x29, "AcDbTextStyleTableRecord")
+              + "  2\nStandard\n 70\n0\n 40\n0.0\n 41\n1.0\n 50\n0.0\n 71\n0\n 42\n2.5\n  3\ntxt\n  4\n\n  0\nENDTAB\n")
+        write(dxf_table("VIEW", 0) + "  0\nENDTAB\n" + dxf_table("UCS", 0) + "  0\nENDTAB\n")
+        write(dxf_table("APPID", 1) + dxf_record("APPID", 0x2A, "AcDbRegAppTableRecord") + "  2\nACAD\n 70\n0\n  0\nENDTAB\n")
+        write(dxf_table("DIMSTYLE", 1, "100\nAcDbDimStyleTable\n") + dxf_record("DIMSTYLE", 0x2B, "AcDbDimStyleTableRecord", 105)
+              + "  2\nStandard\n 70\n0\n  0\nENDTAB\n")
+        write(dxf_table("BLOCK_RECORD", 2))
+        for name, block in (("*Model_Space", "model"), ("*Paper_Space", "paper")):
+            write(dxf_record("BLOCK_RECORD", h[block], "AcDbBlockTableRecord") + "  2\n%s\n340\n%X\n" % (name, h[block + "_layout"]))
+        write("  0\nENDTAB\n  0\nENDSEC\n  0\nSECTION\n  2\nBLOCKS\n")
+        for name, block in (("*Model_Space", "model"), ("*Paper_Space", "paper")):
+            write("  0\nBLOCK\n  5\n%X\n330\n%X\n100\nAcDbEntity\n  8\n0\n100\nAcDbBlockBegin\n  2\n%s\n 70\n0\n"
+                  " 10\n0.0\n 20\n0.0\n 30\n0.0\n  3\n%s\n  1\n\n" % (h[block] + 1, h[block], name, name))
+            write("  0\nENDBLK\n  5\n%X\n330\n%X\n100\nAcDbEntity\n  8\n0\n100\nAcDbBlockEnd\n" % (h[block] + 2, h[block]))
+        write("  0\nENDSEC\n  0\nSECTION\n  2\nENTITIES\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def next_handle(self):
+        self.handle += 1
+        return self.handle - 1
+
+    def entity(self, name, layer, subclasses = ()): # Start of an entity
+        if self.subclass:
+            self.file.write("  0\n%s\n  5\n%X\n330\n%X\n100\nAcDbEntity\n  8\n%s\n" % (name, self.next_handle(), dxf_handles["model"], layer)
+                            + "".join("100\n%s\n" % sub for sub in subclasses))
+        else:
+            self.file.write("  0\n%s\n  8\n%s\n" % (name, layer))
+
+    def polyline(self, points, layer = "0", closed = False): # points is an (n, 2) array
+        values = np.asarray(points, dtype = float).ravel().tolist()
+        if self.lwpolyline:
+            self.entity("LWPOLYLINE", layer, ("AcDbPolyline",))
+            self.file.write(" 90\n%d\n 70\n%d\n" % (len(values) // 2, int(closed)))
+            self.file.write((" 10\n" + dxf_float + "\n 20\n" + dxf_float + "\n") * (len(values) // 2) % tuple(values))
+        else:
+            self.entity("POLYLINE", layer)
+            self.file.write(" 66\n1\n 10\n0.0\n 20\n0.0\n 30\n0.0\n 70\n%d\n" % int(closed))
+            vertex = ("  0\nVERTEX\n  8\n" + layer.replace("%", "%%") + "\n 10\n" + dxf_float + "\n 20\n" + dxf_float + "\n 30\n0.0\n")
+            self.file.write(vertex * (len(values) // 2) % tuple(values))
+            self.file.write("  0\nSEQEND\n  8\n%s\n" % layer)
+
+    def arc(self, center, radius, start, end, layer = "0"): # Counterclockwise from start to end, in degrees
+        self.entity("ARC", layer, ("AcDbCircle",))
+        self.file.write((" 10\n" + dxf_float + "\n 20\n" + dxf_float + "\n 30\n0.0\n 40\n" + dxf_float + "\n")
+                        % (float(center[0]), float(center[1]), float(radius)))
+        if self.subclass:
+            self.file.write("100\nAcDbArc\n")
+        self.file.write((" 50\n" + dxf_float + "\n 51\n" + dxf_float + "\n") % (float(start), float(end)))
+
+    def circle(self, center, radius, layer = "0"):
+        self.entity("CIRCLE", layer, ("AcDbCircle",))
+        self.file.write((" 10\n" + dxf_float + "\n 20\n" + dxf_float + "\n 30\n0.0\n 40\n" + dxf_float + "\n")
+                        % (float(center[0]), float(center[1]), float(radius)))
+
+    def text(self, insert, height, text, layer = "0"):
+        self.entity("TEXT", layer, ("AcDbText",))
+        self.file.write((" 10\n" + dxf_float + "\n 20\n" + dxf_float + "\n 30\n0.0\n 40\n" + dxf_float + "\n  1\n%s\n")
+                        % (float(insert[0]), float(insert[1]), float(height), text))
+        if self.subclass:
+            self.file.write("100\nAcDbText\n")
+
+    def abort(self): # Deletes the unfinished file, so a truncated file can't be taken for a complete one
+        if not self.file.closed:
+            self.file.close()
+            os.remove(self.file.name)
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.write("  0\nENDSEC\n")
+        if self.lwpolyline:
+            h = dxf_handles
+            self.file.write("  0\nSECTION\n  2\nOBJECTS\n"
+                            + dxf_dictionary(h["root"], 0, (("ACAD_GROUP", h["groups"]), ("ACAD_LAYOUT", h["layouts"]),
+                                                            ("ACAD_PLOTSTYLENAME", h["plot_styles"])))
+                            + dxf_dictionary(h["groups"], h["root"])
+                            + dxf_dictionary(h["layouts"], h["root"], (("Model", h["model_layout"]), ("Layout1", h["paper_layout"])))
+                            + "  0\nACDBDICTIONARYWDFLT\n  5\n%X\n330\n%X\n100\nAcDbDictionary\n281\n1\n  3\nNormal\n350\n%X\n"
+                              "100\nAcDbDictionaryWithDefault\n340\n%X\n" % (h["plot_styles"], h["root"], h["normal"], h["normal"])
+                            + "  0\nACDBPLACEHOLDER\n  5\n%X\n330\n%X\n" % (h["normal"], h["plot_styles"])
+                            + dxf_layout("Model", h["model_layout"], h["model"], 1024, 0)
+                            + dxf_layout("Layout1", h["paper_layout"], h["paper"], 0, 1)
+                            + "  0\nENDSEC\n")
+        self.file.write("  0\nEOF\n")
+        if self.lwpolyline:
+            self.file.seek(self.seed)
+            self.file.write("%0*X" % (seed_width, self.handle))
+        self.file.close()
+
+arc_types = (TIP, FILLET_L, FILLET_R, ROOT) # Segment types that are circular arcs
+
+# Below is a function that returns the center, radius and DXF angles (counterclockwise, in degrees) of
+# the circular arc through the first, middle and last points of a segment, or None when they are
+# (nearly) on a line
+def arc_through(line):
+    if len(line) < 3:
+        return None
+    (x1, y1), (x2, y2), (x3, y3) = line[0], line[len(line) // 2], line[-1]
+    d = 2 * (x1 * (y2 - y3) + x2 * (y3 - y1) + x3 * (y1 - y2))
+    if abs(d) <= 1e-12 * max(np.ptp(line[:, 0]), np.ptp(line[:, 1]))**2:
+        return None
+    cx = ((x1**2 + y1**2) * (y2 - y3) + (x2**2 + y2**2) * (y3 - y1) + (x3**2 + y3**2) * (y1 - y2)) / d
+    cy = ((x1**2 + y1**2) * (x3 - x2) + (x2**2 + y2**2) * (x1 - x3) + (x3**2 + y3**2) * (x2 - x1)) / d
+    start = np.degrees(np.arctan2(y1 - cy, x1 - cx))
+    end = np.degrees(np.arctan2(y3 - cy, x3 - cx))
+    if d < 0: # The points go clockwise
+        start, end = end, start
+    return (cx, cy), np.hypot(x1 - cx, y1 - cy), start, end
+
+# Below is a function that writes segments of a profile to a DXF file with DxfStream. It gives the same
+# geometry as write_dxf(). With arcs = True the tip, fillet and root segments are written as true arcs.
+def write_dxf_stream(profile, rows, filename, lwpolyline = False, arcs = False, layer = "0"):
+    if rows is None:
+        rows = range(len(profile))
+    with DxfStream(filename, (layer,), lwpolyline) as dxf:
+        for row in rows:
+            line = profile.polyline(row)
+            arc = arc_through(line) if arcs and profile.segments["type"][row] in arc_types else None
+            if arc is None:
+                dxf.polyline(line, layer)
+            else:
+                dxf.arc(*arc, layer = layer)
+
+### Gear Generation
+    # generate() runs every stage for one designation and collects the results in a single dictionary.
+    # The keys are the variable names used throughout this script (x1, da1, s_min, ...), and the
+    # geometry is in the GearProfile objects "shaft" and "hub". gear_values() returns the same
+    # dictionary without the geometry and the pins.
+
+def gear_values(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, points = points):
+    gear = {"dB": dB, "mod": mod, "z1": z1, "points": points,
+            "shaft_designation": "W%gx%gx%dx%d%s" % (dB, mod, z1, TolGrade_s, DevLetter_s), # Ex: W30x1x28x8j
+            "hub_designation": "N%gx%gx%dx%d%s" % (dB, mod, z1, TolGrade_e, DevLetter_e)} # Ex: N30x1x28x9H
+    gear.update(parameters(dB, mod, z1, MachMethod, FilletMethod))
+    gear.update(tolerances(dB, mod, z1, TolGrade_s, DevLetter_s, "shaft"))
+    gear.update(tolerances(dB, mod, z1, TolGrade_e, DevLetter_e, "hub"))
+
+    # Values that the shaft and hub geometry stages depend on
+    gear["shaft_key"] = (gear["rb"], gear["rp"], gear["rFf1"], gear["ra1"], gear["rf1"], gear["rho"], gear["s"], z1, points)
+    gear["hub_key"] = (gear["rb"], gear["rp"], gear["ra2"], gear["rFf2"], gear["rf2"], gear["rho"], gear["e"], z1, points)
+    return gear
+
+def generate(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, points = points):
+    gear = gear_values(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, points)
+    gear["shaft"] = shaft_segments(*gear["shaft_key"])
+    gear["hub"] = hub_segments(*gear["hub_key"])
+    gear["thetaHK_s"] = gear["shaft"].thetaHK
+    gear["thetaHK_e"] = gear["hub"].thetaHK
+
+    gear["MoP_shaft"], gear["d_pin_shaft"] = pins(z1, gear["x1"], mod)
+    gear["MoP_hub"], gear["d_pin_hub"] = pins(gear["z2"], gear["x2"], mod)
+    return gear
+
+# Below is a function that splits a designation like "W30x1x28x8j" (shaft) or "N30x1x28x9H" (hub) into
+# (side, dB, mod, z1, tolerance grade, deviation letter)
+def parse_designation(designation):
+    match = re.fullmatch(r"\s*([WN])\s*(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)\s*x\s*(\d+)\s*x\s*(\d+)\s*([A-Za-z])\s*", designation)
+    if match is None:
+        raise ValueError("Invalid designation " + repr(designation) + ". The format is W or N, then dB x m x z x grade letter, ex: W30x1x28x8j")
+    side = "shaft" if match.group(1) == "W" else "hub"
+    return side, float(match.group(2)), float(match.group(3)), int(match.group(4)), float(match.group(5)), match.group(6)
+
+### Plot Reference Lines Generation
+    # This section of the code was made to show important gear parameters their plots
+
+def onearc(CircRad, AngRang):
+    x = CircRad * np.cos(AngRang)
+    y = CircRad * np.sin(AngRang)
+    return x, y
+
+### Spline Profile Plots
+
+# Below is a function that plots segments of a profile, one line per segment
+def plot_segments(ax, profile, rows = None):
+    for polyline in profile.polylines(rows):
+        ax.plot(polyline[:, 0], polyline[:, 1])
+
+# Below is a function that draws one of the four plots on a matplotlib axes: 1 is one shaft tooth,
+# 2 the entire shaft, 3 one hub space width and 4 the entire hub
+def draw_plot(ax, gear, number):
+    g = gear
+    points = g["points"]
+    p_sector = g["p_sector"]
+    PitchRange = np.linspace(-p_sector/2, p_sector/2, 2*points)
+
+    if number == 1: # Shaft Plot of one tooth:
+        sector_s = g["s"] / g["rp"] # Central angle encompassing one tooth thickness
+        PitchCircX, PitchCircY = onearc(g["rp"], PitchRange) # Pitch circle coordinates
+        RootCircX_s, RootCircY_s = onearc(g["rf1"], PitchRange) # Shaft Root circle coordinates
+        FormCircX_s, FormCircY_s = onearc(g["rFf1"], PitchRange) # Shaft Form circle coordinates
+        ToothThickX, ToothThickY = onearc(g["rp"], np.linspace(-sector_s/2, sector_s/2, points)) # Shaft tooth thickness coordinates
+        TipCircX_s, TipCircY_s = onearc(g["ra1"], PitchRange) # Shaft tip circle coordinates
+
+        ax.set_title("Plot of One Shaft Gear Tooth (mm)")
+        plot_segments(ax, g["shaft"], g["shaft"].tooth(0)) # Involute Sides, Tooth Tip, Root Fillets and Root Circle
+
+        ax.plot(PitchCircX, PitchCircY, '--', label = 'Pitch Circle, d = ' + str(round(g["dp"],2))) # Spline parameters for reference
+        ax.plot(RootCircX_s, RootCircY_s, '--', label = 'Root Circle, d_f1 = ' + str(round(g["df1"],2)))
+        ax.plot(TipCircX_s, TipCircY_s, '--', label = 'Tip Circle, d_a1 = ' + str(round(g["da1"],2)))
+        ax.plot(FormCircX_s, FormCircY_s, '--', label = 'Form Circle, d_Ff1 = ' + str(round(g["dFf1"],2)))
+        ax.plot(ToothThickX, ToothThickY, linewidth = 3, label = 'Tooth Thickness, s1 = ' + str(round(g["s_min"],4)) + ' - ' +str(round(g["s_max"],4)))
+        ax.plot(g["ra1"] * np.cos(-p_sector), g["ra1"] * np.sin(-p_sector)) # Point to help position the plot to accomadate for the label
+        ax.legend(loc = 'lower right')
+
+    elif number == 2: # Shaft Plot of the entire spline
+        ax.set_title("Plot of the Shaft Involute Spline (mm)")
+        plot_segments(ax, g["shaft"])
+
+    elif number == 3: # Hub Plot of one space width
+        sector_e = g["e"] / g["rp"] # Central angle encompassing one space width
+        PitchCircX, PitchCircY = onearc(g["rp"], PitchRange) # Pitch circle coordinates
+        RootCircX_e, RootCircY_e = onearc(g["rf2"], PitchRange) # Hub Root circle coordinates
+        FormCircX_e, FormCircY_e = onearc(g["rFf2"], PitchRange) # Hub Form circle coordinates
+        SpaceWidX, SpaceWidY = onearc(g["rp"], np.linspace(-sector_e/2, sector_e/2, points)) # Hub tooth thickness coordinates
+        TipCircX_e, TipCircY_e = onearc(g["ra2"], np.linspace(-p_sector * 0.65, p_sector * 0.65, 2*points)) # Hub tip circle coordinates
+
+        ax.set_title("Plot of One Hub Gear Tooth (mm)")
+        plot_segments(ax, g["hub"], g["hub"].tooth(0)) # Involute Sides, Hub Tooth Tip (half of a tip on each side of the space width), Root Fillets and Root Circle
+
+        ax.plot(PitchCircX, PitchCircY, '--', label = 'Pitch Circle, d = ' + str(round(g["dp"],2))) # Spline parameters for reference
+        ax.plot(RootCircX_e, RootCircY_e, '--', label = 'Root Circle, d_f2 = ' + str(round(g["df2"],2)))
+        ax.plot(TipCircX_e, TipCircY_e, '--', label = 'Tip Circle, d_a2 = ' + str(round(g["da2"],2)))
+        ax.plot(FormCircX_e, FormCircY_e, '--', label = 'Form Circle, d_Ff2 = ' + str(round(g["dFf2"],2)))
+        ax.plot(SpaceWidX, SpaceWidY, linewidth = 3, label = 'Space Width, e2 = ' + str(round(g["e_min"],4)) + ' - ' +str(round(g["e_max"],4)))
+        ax.plot(g["rf2"] * np.cos(-p_sector), g["rf2"] * np.sin(-p_sector)) # Point to help position the plot to accomadate for the label
+        ax.legend(loc = 'lower right')
+
+    else: # Hub Plot of the entire spline
+        ax.set_title("Plot of the Hub Involute Spline (mm)")
+        plot_segments(ax, g["hub"])
+
+# Below is a function that shows the four plots as pyplot figures 1-4
+def plot(gear):
+    for number in range(1, 5):
+        draw_plot(plt.figure(number).gca(), gear, number)
+
+### Export Pipeline
+    # export() writes the requested artifacts of a generated gear. The artifacts don't depend on each
+    # other, so they are written concurrently on a bounded pool of worker threads (or processes, which
+    # avoids sharing one interpreter between the DXF writers). An error in one artifact doesn't stop
+    # the others, it is returned for that artifact. The exports are memoized per file: the cache keeps
+    # what was last written to every path and the size and modification time of the file, and an
+    # artifact is only skipped when the file on disk is still the one it wrote from the same inputs.
+
+# Artifacts that export() can write and their default file names. A file name can contain any key of
+# the gear dictionary between braces, ex: "{shaft_designation}_Shaft.dxf" -> "W30x1x28x8j_Shaft.dxf"
+artifact_names = {"tooth_dxf": "Shaft_Tooth.dxf", "space_dxf": "Space_Width.dxf",
+                  "shaft_dxf": "Shaft.dxf", "hub_dxf": "Hub.dxf",
+                  "tooth_points": "Tooth_PointsFile.asc", "space_points": "SpaceWidth_PointsFile.asc",
+                  "shaft_points": "Shaft_PointsFile.asc", "hub_points": "Hub_PointsFile.asc",
+                  "tooth_plot": "Shaft_Tooth.png", "shaft_plot": "Shaft.png",
+                  "space_plot": "Space_Width.png", "hub_plot": "Hub.png"}
+
+default_artifacts = ("tooth_dxf", "space_dxf", "shaft_dxf", "hub_dxf")
+
+# Profile and whether only the first tooth is written, for the DXF and points file artifacts
+artifact_profiles = {"tooth": ("shaft", True), "space": ("hub", True), "shaft": ("shaft", False), "hub": ("hub", False)}
+
+plot_numbers = {"tooth_plot": 1, "shaft_plot": 2, "space_plot": 3, "hub_plot": 4}
+
+stage_caches["exports"] = {} # {absolute path: (artifact, inputs, dxf_writer, size, modification time)}
+stage_counts["exports"] = 0
+
+def file_stamp(path): # Size and modification time of a file, None when it doesn't exist
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_size, info.st_mtime_ns
+
+# Below is a function that returns what an artifact is made from: the data the worker needs and the
+# inputs that the artifact depends on (used to memoize the export)
+def artifact_data(gear, artifact):
+    if artifact in plot_numbers:
+        data = {key: value for key, value in gear.items() if not key.endswith("_key")}
+        inputs = (gear["shaft_key"], gear["hub_key"], gear["s_min"], gear["s_max"], gear["e_min"], gear["e_max"])
+        return data, inputs
+    side, single = artifact_profiles[artifact.rsplit("_", 1)[0]]
+    return (gear[side], single), gear[side + "_key"]
+
+# Below is a function that writes one artifact. It runs on the worker threads or processes.
+def write_artifact(artifact, data, path, dxf_writer = "ezdxf"):
+    if artifact in plot_numbers:
+        fig = Figure()
+        draw_plot(fig.add_subplot(), data, plot_numbers[artifact])
+        fig.savefig(path)
+        return path
+    profile, single = data
+    rows = profile.tooth(0) if single else None
+    if artifact.endswith("_dxf") and dxf_writer == "stream":
+        write_dxf_stream(profile, rows, path)
+    elif artifact.endswith("_dxf"):
+        write_dxf(profile, rows, path)
+    else:
+        np.savetxt(path, profile.points_array(rows), delimiter = ",")
+    return path
+
+# Below is a function that writes artifacts of a generated gear into a folder. Names replaces some of
+# the default file names, and dxf_writer = "stream" writes the DXF files with DxfStream instead of
+# ezdxf. It returns {artifact: (path, error)}, where error is None when the artifact was written.
+def export(gear, artifacts = default_artifacts, folder = ".", names = None, workers = 4, processes = False, dxf_writer = "ezdxf"):
+    names = dict(artifact_names, **(names or {}))
+    os.makedirs(folder, exist_ok = True)
+    cache = stage_caches["exports"]
+    results = {}
+    jobs = []
+    Pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with Pool(max_workers = workers) as pool:
+        for artifact in artifacts:
+            try:
+                path = os.path.join(folder, names[artifact].format(**gear))
+                data, inputs = artifact_data(gear, artifact)
+            except Exception as error: # Unknown artifact or bad file name
+                results[artifact] = (None, error)
+                continue
+            key = os.path.abspath(path)
+            written = (artifact, inputs, dxf_writer)
+            stamp = file_stamp(key)
+            if stamp is not None and cache.get(key) == written + stamp:
+                results[artifact] = (path, None)
+            else:
+                cache.pop(key, None) # The file is rewritten, or another gear wrote to it
+                jobs.append((artifact, key, written, path, pool.submit(write_artifact, artifact, data, path, dxf_writer)))
+
+        for artifact, key, written, path, job in jobs:
+            error = job.exception()
+            stamp = file_stamp(key)
+            if error is None and stamp is not None:
+                cache[key] = written + stamp
+                stage_counts["exports"] += 1
+            results[artifact] = (path, error)
+    return results
+
+if __name__ == "__main__":
+
+    ### Inputs
+
+    dB = float(input("Enter the Reference Diameter (d_B): "))
+    mod = float(input("Enter the Module (m): "))
+    z1 = int(input("Enter the number of teeth (z): "))
+    TolGrade_s = float(input("Enter the tolerance grade number for the shaft: "))
+    DevLetter_s = input("Enter the deviation grade letter for the shaft: ")
+    TolGrade_e = float(input("Enter the tolerance grade number for the hub: "))
+    DevLetter_e = input("Enter the deviation grade letter for the hub: ")
+    MachMethod = input("Enter the machining method (broaching, hobbing, gear shaping, or cold rolling): ")
+    FilletMethod = input("Enter the creation method for the root fillet (chip-removal or cold rolling): ")
+
+    #Below is an example of input values
+    # dB = 30
+    # mod = 1
+    # z1 = 28
+    # TolGrade_s = 8
+    # DevLetter_s = "j"
+    # TolGrade_e = 9
+    # DevLetter_e = "H"
+    # MachMethod = "broaching"
+    # FilletMethod = "chip-removal"
+
+    gear = generate(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod)
+
+    print("")
+    print("The external spline measurement across pins is", round(gear["MoP_shaft"], 4), "mm", "using pins with a diameter of", gear["d_pin_shaft"], "mm")
+    print("The internal spline measurement across pins is", round(gear["MoP_hub"], 4), "mm", "using pins with a diameter of", gear["d_pin_hub"], "mm")
+    print("The root fillet radius is", gear["rho"], "mm")
+    limits = mop_acceptance(gear)
+    for side, name in (("shaft", "external"), ("hub", "internal")):
+        low, high, effective = (round(limits["MoP_" + key], 4) for key in limit_keys[side])
+        print("The", name, "spline is accepted for measurements across pins from", min(low, high), "to", max(low, high),
+              "mm (effective limit", effective, "mm) using pins with a diameter of", limits["d_pin_limits_" + side], "mm")
+
+    plot(gear)
+
+    # To also write the points files or save the plots, add "tooth_points", "space_points", "shaft_points",
+    # "hub_points" or "tooth_plot", "shaft_plot", "space_plot", "hub_plot" to the artifacts.
+    # Ex: export(gear, default_artifacts + ("shaft_points", "hub_points"), folder = "output")
+    for artifact, (path, error) in export(gear).items():
+        if error is not None:
+            print("The", artifact, "artifact could not be written to", path, ":", error)
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# This script is a regression check for GearSplineGenerator_Rev4.py. It generates a fixed set of
+# designations that covers small and large modules, odd and even numbers of teeth, every machining
+# method and both fillet methods, and compares the results with the reference ("golden") results
+# stored in the golden folder:
+    # - the gear parameters, tolerances and measurements over pins
+    # - the points arrays of the shaft tooth, hub space width, shaft and hub
+    # - the geometry of every entity in the four DXF files (not the bytes of the files, which
+    #   contain handles and time stamps that change every run), written with ezdxf and with the
+    #   DxfStream writer, which must give the same geometry
+# It also checks that regenerating a designation with one input changed only recomputes the stages
+# that depend on that input (see stage_counts), and that a memoized export always leaves the file
+# of the last exported gear on disk, and that the DxfStream files need no fixes when they are read.
+
+# Run it before and after changing the generator:
+    # python GoldenGeometryCheck.py          compares the current results with the references
+    # python GoldenGeometryCheck.py record   replaces the references with the current results
+# Only record new references when a change of the geometry is intended.
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import ezdxf
+from ezdxf import recover
+
+import GearSplineGenerator_Rev4 as gsg
+
+golden_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+ATOL = 1e-9 # Allowed absolute difference of lengths in mm (and of angles in radians)
+RTOL = 1e-12 # Allowed relative difference
+
+# dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod
+cases = [(6, 0.5, 10, 7, "h", 7, "H", "broaching", "chip-removal"),
+         (17, 0.8, 20, 6, "k", 6, "K", "hobbing", "chip-removal"),
+         (30, 1, 28, 8, "j", 9, "H", "broaching", "chip-removal"),
+         (45, 2, 21, 9, "e", 8, "H", "hobbing", "cold rolling"),
+         (35, 2, 16, 8, "f", 9, "H", "cold rolling", "cold rolling"),
+         (50, 5, 8, 5, "h", 5, "H", "gear shaping", "chip-removal"),
+         (100, 5, 19, 7, "h", 7, "G", "broaching", "chip-removal"),
+         (120, 5, 22, 10, "d", 11, "F", "gear shaping", "cold rolling"),
+         (500, 10, 48, 12, "a", 12, "M", "cold rolling", "cold rolling")]
+
+scalar_keys = ["x1", "x2", "hap", "hfp", "hP", "cP", "rho", "dp", "db", "da1", "df1", "dFf1", "da2", "df2",
+               "dFf2", "cFP", "cFmin", "s1", "s_vmax", "s_max", "s_min", "s", "e2", "e_max", "e_min", "e_vmin",
+               "e", "thetaHK_s", "thetaHK_e", "MoP_shaft", "d_pin_shaft", "MoP_hub", "d_pin_hub"]
+
+# Points arrays and DXF files that are compared: name, DXF name, export artifact, profile, and whether
+# only the first tooth is used
+outputs = [("ToothPoints", "Shaft_Tooth", "tooth_dxf", "shaft", True), ("SpacePoints", "Space_Width", "space_dxf", "hub", True),
+           ("ShaftPoints", "Shaft", "shaft_dxf", "shaft", False), ("HubPoints", "Hub", "hub_dxf", "hub", False)]
+
+def case_name(case): # File name of the reference of a case, ex: W30x1x28x8j_N9H_broaching_chip-removal
+    dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod = case
+    name = "W%gx%gx%dx%d%s_N%d%s_%s_%s" % (dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod)
+    return name.replace(" ", "-")
+
+# Below is a function that reads the geometry of every entity of a DXF file. It returns the entity
+# types, the offset of each entity in the coordinate array, and the coordinate array itself.
+def dxf_geometry(filename):
+    types = []
+    offsets = [0]
+    coords = []
+    for entity in ezdxf.readfile(filename).modelspace():
+        kind = entity.dxftype()
+        if kind == "POLYLINE":
+            values = [tuple(vertex.dxf.location)[:2] for vertex in entity.vertices]
+        elif kind == "LWPOLYLINE":
+            values = [point[:2] for point in entity.get_points("xy")]
+        elif kind == "ARC":
+            values = [tuple(entity.dxf.center)[:2], (entity.dxf.radius, 0), (entity.dxf.start_angle, entity.dxf.end_angle)]
+        else:
+            values = []
+        types.append(kind)
+        coords.extend(values)
+        offsets.append(len(coords))
+    return np.array(types), np.array(offsets), np.reshape(np.array(coords, dtype = float), (-1, 2))
+
+# Below is a function that generates one case and collects every value that is compared
+def results(case, dxf_writer = "ezdxf"):
+    gear = gsg.generate(*case)
+    result = {key: np.float64(gear[key]) for key in scalar_keys}
+    with tempfile.TemporaryDirectory() as folder:
+        written = gsg.export(gear, [output[2] for output in outputs], folder, dxf_writer = dxf_writer)
+        for key, name, artifact, side, single in outputs:
+            profile = gear[side]
+            result[key] = profile.points_array(profile.tooth(0) if single else None)
+            filename, error = written[artifact]
+            if error is not None:
+                raise error
+            types, offsets, coords = dxf_geometry(filename)
+            result["dxf_" + name + "_types"] = types
+            result["dxf_" + name + "_offsets"] = offsets
+            result["dxf_" + name + "_coords"] = coords
+    return result
+
+# Below is a function that compares new results with the reference results. It returns a list of
+# the differences that were found.
+def compare(reference, result):
+    errors = []
+    for key in reference.files:
+        if key not in result:
+            errors.append(key + " is missing")
+            continue
+        ref = reference[key]
+        new = np.asarray(result[key])
+        if ref.shape != new.shape:
+            errors.append("%s has shape %s instead of %s" % (key, new.shape, ref.shape))
+        elif ref.dtype.kind in "UO" or key.endswith("_offsets"):
+            if not np.array_equal(ref, new):
+                errors.append(key + " is different")
+        elif not np.allclose(new, ref, rtol = RTOL, atol = ATOL, equal_nan = True):
+            errors.append("%s differs by up to %.3g" % (key, np.nanmax(np.abs(new - ref))))
+    return errors
+
+def record():
+    os.makedirs(golden_dir, exist_ok = True)
+    for case in cases:
+        np.savez_compressed(os.path.join(golden_dir, case_name(case) + ".npz"), **results(case))
+        print("Recorded", case_name(case))
+
+# Below is a function that checks that the memoized stages only recompute what changed: regenerating
+# a case with only the shaft deviation letter changed must recompute the shaft tolerances and shaft
+# segments once and nothing of the parameters, hub segments or pins. It returns a list of errors.
+def check_stages():
+    case = cases[2]
+    changed = case[:4] + ("h",) + case[5:]
+    gsg.clear_stages()
+    gsg.generate(*case)
+    before = dict(gsg.stage_counts)
+    gsg.generate(*changed)
+    expected = {"parameters": 0, "hub_segments": 0, "pins": 0, "tolerances": 1, "shaft_segments": 1}
+    return ["%s was computed %d times instead of %d" % (name, gsg.stage_counts[name] - before[name], count)
+            for name, count in expected.items() if gsg.stage_counts[name] - before[name] != count]
+
+# Below is a function that checks that a memoized export never leaves the wrong file on disk: gear A,
+# then gear B, then gear A again are exported to the same Shaft.dxf, and the file is deleted and
+# exported again. An unchanged file from the same gear must not be written again. It returns a list
+# of errors.
+def check_exports():
+    errors = []
+    A = gsg.generate(*cases[2])
+    B = gsg.generate(*cases[0])
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, gsg.artifact_names["shaft_dxf"])
+        for gear in (A, B, A):
+            gsg.export(gear, ["shaft_dxf"], folder)
+        reference = dxf_geometry(path)[2]
+        written = gsg.stage_counts["exports"]
+        gsg.export(A, ["shaft_dxf"], folder)
+        if gsg.stage_counts["exports"] != written:
+            errors.append("an unchanged Shaft.dxf was written again")
+        if not np.array_equal(reference, A["shaft"].points_array()[:, :2]):
+            errors.append("Shaft.dxf doesn't hold the last exported gear")
+        os.remove(path)
+        gsg.export(A, ["shaft_dxf"], folder)
+        if not os.path.exists(path):
+            errors.append("a deleted Shaft.dxf wasn't written again")
+    return errors
+
+# Below is a function that checks that ezdxf reads the R12 and AC1015 files of DxfStream without having
+# to fix anything, since strict DXF readers (CAD and EDM software) don't fix files. It returns a list
+# of errors.
+def check_dxf_audit():
+    errors = []
+    gear = gsg.generate(*cases[2])
+    with tempfile.TemporaryDirectory() as folder:
+        for lwpolyline in (False, True):
+            for arcs in (False, True):
+                filename = os.path.join(folder, "Hub.dxf")
+                gsg.write_dxf_stream(gear["hub"], None, filename, lwpolyline, arcs)
+                doc, auditor = recover.readfile(filename)
+                for audit in (auditor, doc.audit()):
+                    errors += ["%s%s: %s" % (doc.dxfversion, " with arcs" if arcs else "", entry.message)
+                               for entry in list(audit.fixes) + list(audit.errors)]
+    return errors
+
+# Below is a function that prints the errors of an extra check and returns 1 if it failed
+def report(name, errors):
+    print(("FAIL " if errors else "ok   ") + name)
+    for error in errors:
+        print("    ", error)
+    return 1 if errors else 0
+
+def check():
+    failed = 0
+    for case in cases:
+        name = case_name(case)
+        with np.load(os.path.join(golden_dir, name + ".npz")) as reference:
+            errors = compare(reference, results(case))
+            errors += ["DxfStream: " + error for error in compare(reference, results(case, "stream"))
+                       if error.startswith("dxf_")]
+        if errors:
+            failed += 1
+            print("FAIL", name)
+            for error in errors:
+                print("    ", error)
+        else:
+            print("ok  ", name)
+    return failed
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record()
+        failed = 0
+    else:
+        failed = check()
+        print(len(cases) - failed, "of", len(cases), "cases match the references")
+        failed += report("stage recompute counts", check_stages())
+        failed += report("export memo", check_exports())
+        failed += report("DxfStream audit", check_dxf_audit())
+    print("Finished in %.2f s" % (time.perf_counter() - start))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+# This script makes several levels of detail of a gear from one calculation, for example a light
+# preview for a web viewer and the full resolution profile for the EDM, instead of running the
+# generator once for every value of "points".
+
+# The gear is generated once with enough points per segment for the finest requested tolerance: the
+# chord error of the polylines (the largest distance between a polyline and the curve it follows) is
+# estimated from the local curvature of the points, and the number of points is raised until that
+# error is at most half of the finest tolerance. Since every tooth is a rotated copy of the first one,
+# the number of points is searched on the first tooth alone, and the whole profile is only generated
+# for the number that is found. Every level is then made from that profile with the
+# Douglas-Peucker algorithm on each segment, which keeps the end points of every segment exactly and
+# guarantees that every removed point lies within (tolerance - chord error) of the simplified
+# polyline, so every level is within its tolerance of the exact profile. All teeth are rotated copies
+# of the first one, so only the segments of the first tooth are simplified and the kept points are
+# taken from the other teeth at the same positions.
+
+# Every level is written with DxfStream as one closed polyline per contour, either to its own DXF file
+# (ex: Hub_0.01mm.dxf) or to its own layer (ex: LOD_0.01mm) of a single DXF file. The coordinates of a
+# level are rounded to a hundredth of its tolerance or finer, which makes the coarse levels much
+# smaller files, and 1% of the tolerance is kept for that rounding.
+
+import os
+
+import numpy as np
+
+import GearSplineGenerator_Rev4 as gsg
+
+# Below is a function that estimates the chord error of the segments of the first tooth of a profile.
+# The chord between two points of a curve with the radius of curvature R and the length L is at most
+# L**2 / (8 * R) away from the curve. The curvature is taken from the circle through three
+# neighboring points, the larger of the two circles that contain each chord.
+def chord_error(profile):
+    errors = [0.0]
+    for line in profile.polylines(profile.tooth(0)):
+        if len(line) < 3:
+            continue
+        a, b, c = line[:-2], line[1:-1], line[2:]
+        ab = np.hypot(*(b - a).T)
+        bc = np.hypot(*(c - b).T)
+        ac = np.hypot(*(c - a).T)
+        cross = np.abs((b - a)[:, 0] * (c - b)[:, 1] - (b - a)[:, 1] * (c - b)[:, 0])
+        with np.errstate(invalid = "ignore", divide = "ignore"):
+            curvature = np.where(ab * bc * ac > 0, 2 * cross / (ab * bc * ac), 0) # Repeated points have no curvature
+        curvature = np.maximum(np.append(curvature, 0), np.append(0, curvature)) # Curvature of each chord
+        length = np.hypot(*np.diff(line, axis = 0).T)
+        errors.append(np.max(length**2 * curvature / 8))
+    return float(np.max(errors)) # NaN when the profile has invalid points
+
+# Below is a function that simplifies a polyline with the Douglas-Peucker algorithm. It returns the
+# indices of the points that are kept: the first and last points are always kept, and every removed
+# point is at most epsilon away from the simplified polyline.
+def simplify(line, epsilon):
+    keep = np.zeros(len(line), dtype = bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(line) - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, b = line[i], line[j]
+        ab = b - a
+        length2 = ab @ ab
+        t = np.clip((line[i + 1:j] - a) @ ab / length2, 0, 1) if length2 > 0 else np.zeros(j - i - 1)
+        dist = np.hypot(*(line[i + 1:j] - a - t[:, None] * ab).T) # Distance to the segment, not the line
+        k = int(np.argmax(dist))
+        if dist[k] > epsilon:
+            keep[i + 1 + k] = True
+            stack += [(i, i + 1 + k), (i + 1 + k, j)]
+    return np.flatnonzero(keep)
+
+# Below is a function that makes one level of detail of a profile. It returns a new GearProfile with
+# the same segment table (fewer points per segment) and its coordinates in a new buffer.
+def level_profile(profile, epsilon):
+    segments = profile.segments
+    kept = {}
+    for row in profile.tooth(0):
+        kept[segments["slot"][row]] = simplify(profile.polyline(row), epsilon)
+    counts = np.array([len(kept[slot]) for slot in segments["slot"]])
+    index = np.concatenate([kept[slot] for slot in segments["slot"]]) + np.repeat(segments["start"], counts)
+    table = segments.copy()
+    table["count"] = counts
+    table["start"] = np.append(0, np.cumsum(counts)[:-1])
+    return gsg.GearProfile(profile.side, profile.z1, profile.thetaHK, np.ascontiguousarray(profile.coords[index]), table)
+
+# Below is a function that generates a gear once for the finest of the tolerances (mm) and makes a level
+# of detail of the shaft and hub for every tolerance. It returns the gear dictionary of generate() with
+# the levels added: lod_tolerances, lod_shaft and lod_hub (lists of GearProfile, one per tolerance)
+# and the chord errors chord_error_shaft and chord_error_hub of the generated profiles.
+def generate_levels(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, tolerances):
+    tolerances = sorted(tolerances)
+    if not tolerances or not all(np.isfinite(tolerances)) or tolerances[0] <= 0:
+        raise ValueError("The tolerances must be positive numbers of mm, got %r" % (tolerances,))
+    points = gsg.points
+    while True:
+        values = gsg.gear_values(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, points)
+        error = max(chord_error(gsg.shaft_profile(*values["shaft_key"], teeth = 1)), chord_error(gsg.hub_profile(*values["hub_key"], teeth = 1)))
+        if not np.isfinite(error):
+            raise ValueError("The profile has invalid points, check the designation against table 1 of DIN 5480-1")
+        if error <= tolerances[0] / 2:
+            break
+        # The chord error goes down with the square of the number of points
+        points = int(np.ceil((points - 1) * np.sqrt(error / (tolerances[0] / 2)) * 1.05)) + 1
+
+    gear = gsg.generate(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, points)
+    gear["lod_tolerances"] = tolerances
+    for side in ("shaft", "hub"):
+        gear["chord_error_" + side] = chord_error(gear[side])
+        gear["lod_" + side] = [level_profile(gear[side], 0.99 * tolerance - gear["chord_error_" + side]) for tolerance in tolerances]
+    return gear
+
+# Below is a function that returns the closed cut path of a level, rounded to a hundredth of the tolerance
+# or finer (the rounding moves the points by at most 0.71% of the tolerance)
+def level_path(profile, tolerance):
+    return np.round(gsg.cut_path(profile), int(np.ceil(-np.log10(tolerance / 100))))
+
+# Below is a function that writes the levels of detail of a gear (from generate_levels) with DxfStream,
+# one closed polyline per contour. With one_file = False every level of each side is written to its
+# own file, otherwise every side is written to one file with a layer for each level. It returns the
+# paths of the files.
+def write_levels(gear, folder = ".", sides = ("shaft", "hub"), one_file = False):
+    os.makedirs(folder, exist_ok = True)
+    paths = []
+    for side in sides:
+        name = side.capitalize()
+        levels = list(zip(gear["lod_tolerances"], gear["lod_" + side]))
+        if one_file:
+            paths.append(os.path.join(folder, name + "_LOD.dxf"))
+            with gsg.DxfStream(paths[-1], ["LOD_%gmm" % tolerance for tolerance, profile in levels], lwpolyline = True) as dxf:
+                for tolerance, profile in levels:
+                    dxf.polyline(level_path(profile, tolerance), "LOD_%gmm" % tolerance, closed = True)
+            continue
+        for tolerance, profile in levels:
+            paths.append(os.path.join(folder, "%s_%gmm.dxf" % (name, tolerance)))
+            with gsg.DxfStream(paths[-1], lwpolyline = True) as dxf:
+                dxf.polyline(level_path(profile, tolerance), closed = True)
+    return paths
+
+if __name__ == "__main__":
+    dB = float(input("Enter the Reference Diameter (d_B): "))
+    mod = float(input("Enter the Module (m): "))
+    z1 = int(input("Enter the number of teeth (z): "))
+    TolGrade_s = float(input("Enter the tolerance grade number for the shaft: "))
+    DevLetter_s = input("Enter the deviation grade letter for the shaft: ")
+    TolGrade_e = float(input("Enter the tolerance grade number for the hub: "))
+    DevLetter_e = input("Enter the deviation grade letter for the hub: ")
+    MachMethod = input("Enter the machining method (broaching, hobbing, gear shaping, or cold rolling): ")
+    FilletMethod = input("Enter the creation method for the root fillet (chip-removal or cold rolling): ")
+    tolerances = [float(value) for value in input("Enter the tolerances of the levels in mm (ex: 0.001, 0.01, 0.05): ").split(",")]
+    one_file = input("Write every level to its own layer of one file instead of its own file (y/n): ").strip().lower() == "y"
+
+    gear = generate_levels(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod, tolerances)
+    print("")
+    print("Generated with", gear["points"], "points per segment")
+    for side in ("shaft", "hub"):
+        for tolerance, profile in zip(gear["lod_tolerances"], gear["lod_" + side]):
+            print("%-5s %8g mm: %7d points" % (side, tolerance, len(profile.coords)))
+    for path in write_levels(gear, one_file = one_file):
+        print("Written", path, "(%d bytes)" % os.path.getsize(path))
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+# This script nests a batch of shafts and hubs onto one plate and writes a single DXF file of the
+# whole plate for the EDM, instead of placing every Shaft.dxf and Hub.dxf on the sheet by hand.
+
+# Every part is packed as its outer circle: the tip circle (d_a1) for a shaft, or the blank outer
+# diameter for a hub. The circles are packed largest first, each one at the lowest (then leftmost)
+# position where it touches the plate edges or the parts that were already placed, while keeping
+# at least the minimum web between parts and between the parts and the plate edges.
+
+# In the DXF file every part is on its own layer named PART_<cut number>_<designation>. The parts are
+# written in cut order (a nearest neighbor path starting from the plate origin), and the spline of a
+# hub is cut before its blank circle. Each contour is one closed polyline, so the EDM can cut it in
+# a single pass. The plate outline is on the layer PLATE and the cut numbers are on CUT_ORDER.
+
+# The batch file for the command line has one line per kind of part:
+    # designation, machining method, fillet method, quantity[, blank outer diameter for hubs]
+    # Ex: W30x1x28x8j, broaching, chip-removal, 12
+    #     N30x1x28x9H, broaching, chip-removal, 12, 45
+
+import numpy as np
+import ezdxf
+from ezdxf import units
+
+import GearSplineGenerator_Rev4 as gsg
+
+hub_wall = 2 # Default wall of a hub blank in modules, when the blank outer diameter isn't given
+
+# Below is a function that generates one part of a batch from its designation. A shaft part doesn't
+# depend on the hub tolerance and the other way around, so the other side gets the "h"/"H" deviation.
+def generate_part(designation, MachMethod, FilletMethod, blank_od = None, points = gsg.points):
+    side, dB, mod, z1, TolGrade, DevLetter = gsg.parse_designation(designation)
+    if side == "shaft":
+        gear = gsg.generate(dB, mod, z1, TolGrade, DevLetter, TolGrade, "H", MachMethod, FilletMethod, points)
+        radius = gear["ra1"]
+    else:
+        gear = gsg.generate(dB, mod, z1, TolGrade, "h", TolGrade, DevLetter, MachMethod, FilletMethod, points)
+        if blank_od is None:
+            blank_od = gear["df2"] + 2 * hub_wall * mod
+        radius = blank_od / 2
+        if radius <= gear["rf2"]:
+            raise ValueError("The blank outer diameter of " + designation + " must be larger than d_f2 = " + str(round(gear["df2"], 4)))
+    return {"designation": designation.replace(" ", ""), "side": side, "profile": gear[side], "radius": radius}
+
+# Below is a function that packs circles into a width x height plate with a minimum web between the
+# circles and between the circles and the plate edges. It returns the centers, NaN for the circles
+# that didn't fit.
+def pack_circles(radii, width, height, web):
+    radii = np.asarray(radii, dtype = float)
+    n = len(radii)
+    R = radii + web / 2 # Circles that touch each other after growing by half of the web are one web apart
+    low = web / 2 # The plate shrinks by half of the web on every side
+    x_high = width - web / 2
+    y_high = height - web / 2
+    eps = 1e-9 * max(width, height)
+    cx = np.full(n, np.nan)
+    cy = np.full(n, np.nan)
+    placed = []
+
+    for i in np.argsort(-radii, kind = "stable"):
+        r = R[i]
+        px, py, pr = cx[placed], cy[placed], R[placed] + r # pr is the center distance of touching circles
+        cand_x = [np.array([low + r, x_high - r, low + r, x_high - r])] # Corners
+        cand_y = [np.array([low + r, low + r, y_high - r, y_high - r])]
+
+        # Touching a plate edge and a placed circle
+        for y in (low + r, y_high - r):
+            root = np.sqrt(np.maximum(pr**2 - (y - py)**2, 0))
+            cand_x += [px - root, px + root]
+            cand_y += [np.full(len(px), y)] * 2
+        for x in (low + r, x_high - r):
+            root = np.sqrt(np.maximum(pr**2 - (x - px)**2, 0))
+            cand_x += [np.full(len(px), x)] * 2
+            cand_y += [py - root, py + root]
+
+        # Touching two placed circles that are close enough to each other
+        if len(placed) > 1:
+            d = np.hypot(px[:, None] - px[None, :], py[:, None] - py[None, :])
+            I, J = np.nonzero(np.triu(d <= pr[:, None] + pr[None, :], 1))
+            d = d[I, J]
+            a = (pr[I]**2 - pr[J]**2 + d**2) / (2 * d) # Distance from circle I to the chord of the intersections
+            h = np.sqrt(np.maximum(pr[I]**2 - a**2, 0))
+            ux = (px[J] - px[I]) / d
+            uy = (py[J] - py[I]) / d
+            mx = px[I] + a * ux
+            my = py[I] + a * uy
+            cand_x += [mx - h * uy, mx + h * uy]
+            cand_y += [my + h * ux, my - h * ux]
+
+        X = np.concatenate(cand_x)
+        Y = np.concatenate(cand_y)
+        inside = (X >= low + r - eps) & (X <= x_high - r + eps) & (Y >= low + r - eps) & (Y <= y_high - r + eps)
+        X = X[inside]
+        Y = Y[inside]
+        order = np.lexsort((X, np.round(Y / eps))) # Lowest, then leftmost position first
+
+        # The candidates are checked against the placed circles in blocks, in order, until one is free
+        limit = (pr - eps)**2
+        for block in range(0, len(order), 256):
+            k = order[block:block + 256]
+            free = np.all((X[k, None] - px)**2 + (Y[k, None] - py)**2 >= limit, axis = 1)
+            if free.any():
+                best = k[np.argmax(free)]
+                cx[i] = X[best]
+                cy[i] = Y[best]
+                placed.append(i)
+                break
+    return np.column_stack((cx, cy))
+
+# Below is a function that returns the cut order of the placed parts: a nearest neighbor path that
+# starts at the plate origin
+def cut_order(centers):
+    left = list(np.flatnonzero(~np.isnan(centers[:, 0])))
+    order = []
+    current = np.zeros(2)
+    while left:
+        k = int(np.argmin(np.hypot(*(centers[left] - current).T)))
+        order.append(left.pop(k))
+        current = centers[order[-1]]
+    return np.array(order, dtype = int)
+
+# Below is a function that nests a batch of parts (from generate_part) onto a plate. It returns the
+# nest as a dictionary with the part centers, the cut order and the parts that didn't fit.
+def nest(parts, width, height, web):
+    centers = pack_circles([part["radius"] for part in parts], width, height, web)
+    return {"parts": parts, "width": width, "height": height, "web": web, "centers": centers,
+            "order": cut_order(centers), "unplaced": list(np.flatnonzero(np.isnan(centers[:, 0])))}
+
+# Below is a function that writes a nest to one DXF file, with ezdxf or with the DxfStream writer of
+# GearSplineGenerator_Rev4.py (dxf_writer = "stream"), which is much faster for large plates
+def write_nest_dxf(nest, filename, dxf_writer = "ezdxf"):
+    parts = []
+    paths = {} # Cut path of every profile, the parts of a batch share their profiles
+    for number, i in enumerate(nest["order"], start = 1):
+        part = nest["parts"][i]
+        if id(part["profile"]) not in paths:
+            paths[id(part["profile"])] = gsg.cut_path(part["profile"])
+        parts.append(("PART_%03d_%s" % (number, part["designation"]), part, nest["centers"][i], str(number)))
+    plate = [(0, 0), (nest["width"], 0), (nest["width"], nest["height"]), (0, nest["height"])]
+
+    if dxf_writer == "stream":
+        with gsg.DxfStream(filename, ["PLATE", "CUT_ORDER"] + [layer for layer, *_ in parts], lwpolyline = True) as dxf:
+            dxf.polyline(plate, "PLATE", closed = True)
+            for layer, part, center, number in parts:
+                dxf.polyline(paths[id(part["profile"])] + center, layer, closed = True)
+                if part["side"] == "hub":
+                    dxf.circle(center, part["radius"], layer)
+                dxf.text(center, part["radius"] / 4, number, "CUT_ORDER")
+        return
+
+    doc = ezdxf.new()
+    doc.units = units.MM
+    msp = doc.modelspace()
+    doc.layers.add("PLATE")
+    doc.layers.add("CUT_ORDER")
+    msp.add_lwpolyline(plate, close = True, dxfattribs = {"layer": "PLATE"})
+    for layer, part, center, number in parts:
+        doc.layers.add(layer)
+        msp.add_lwpolyline(paths[id(part["profile"])] + center, format = "xy", close = True, dxfattribs = {"layer": layer})
+        if part["side"] == "hub":
+            msp.add_circle(center, part["radius"], dxfattribs = {"layer": layer})
+        msp.add_text(number, height = part["radius"] / 4, dxfattribs = {"layer": "CUT_ORDER", "insert": (center[0], center[1])})
+    doc.saveas(filename)
+
+# Below is a function that reads a batch file (see the top of this script) and generates its parts
+def read_batch(filename, points = gsg.points):
+    parts = []
+    with open(filename) as file:
+        for line in file:
+            fields = [field.strip() for field in line.split(",")]
+            if not fields[0] or fields[0].startswith("#"):
+                continue
+            blank_od = float(fields[4]) if len(fields) > 4 and fields[4] else None
+            part = generate_part(fields[0], fields[1], fields[2], blank_od, points)
+            parts += [part] * int(fields[3])
+    return parts
+
+if __name__ == "__main__":
+    width = float(input("Enter the plate width (mm): "))
+    height = float(input("Enter the plate height (mm): "))
+    web = float(input("Enter the minimum web between the parts (mm): "))
+    batch = input("Enter the batch file name: ")
+    filename = input("Enter the DXF file name for the plate: ")
+
+    result = nest(read_batch(batch), width, height, web)
+    write_nest_dxf(result, filename, dxf_writer = "stream")
+    print(len(result["order"]), "parts were nested on the plate")
+    if result["unplaced"]:
+        print(len(result["unplaced"]), "parts didn't fit:", ", ".join(result["parts"][i]["designation"] for i in result["unplaced"]))
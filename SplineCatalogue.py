@@ -0,0 +1,288 @@
+# -*- coding: utf-8 -*-
+
+# This script builds and reads a precomputed catalogue of DIN 5480-1 splines, so the parameters of a
+# designation (d_a1, d_f1, d_Ff1, s_min, s_max, measurement over pins, ...) can be looked up instantly
+# instead of running GearSplineGenerator_Rev4.py for every query.
+
+# The catalogue covers every reference diameter and module below, every number of teeth whose profile
+# shift is in the -0.05..0.45 range of DIN 5480-1 (with z = 6..82 like table 1), every tolerance grade
+# (5-12), every deviation letter and every machining and fillet method. All values come from the
+# stages of GearSplineGenerator_Rev4.py, so they are the same as the ones generate() returns.
+
+# The catalogue is a folder of three NumPy files that are opened memory-mapped (nothing is read
+# until it is used, and lookups return views into the files instead of copies):
+    # gears.npy       one row per dB x m x z x machining method x fillet method with the gear
+    #                 parameters and measurements over pins. The 8 method rows of a gear are consecutive.
+    # tolerances.npy  one row per dB x m x z x tolerance grade x deviation letter with the tooth
+    #                 thickness (shaft) or space width (hub) limits, sorted by that designation
+    # index.npy       the sorted designation keys of tolerances.npy, searched with a binary search
+
+# Build or rebuild it with all cores, then look up designations:
+    # python SplineCatalogue.py build [folder]
+    # python SplineCatalogue.py N45x2x21x9H [folder]
+# and make the measurement over pins inspection sheet of a file with one designation per line:
+    # python SplineCatalogue.py qa designations.txt sheet.csv [folder]
+
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import GearSplineGenerator_Rev4 as gsg
+
+catalogue_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogue")
+
+### Catalogue Grid
+
+# Reference diameters (mm) and modules (mm) of table 1 in DIN 5480-1
+reference_diameters = [6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 20, 22, 25, 28, 30, 32, 35, 37, 38, 40,
+                       42, 45, 47, 48, 50, 55, 60, 65, 70, 75, 80, 85, 90, 95, 100, 105, 110, 120, 130, 140,
+                       150, 160, 170, 180, 190, 200, 210, 220, 240, 250, 260, 280, 300, 320, 340, 360, 380,
+                       400, 420, 440, 450, 460, 480, 500]
+modules = [0.5, 0.6, 0.75, 0.8, 1, 1.25, 1.5, 1.75, 2, 2.5, 3, 4, 5, 6, 8, 10]
+teeth_range = (6, 82) # Smallest and largest number of teeth
+shift_range = (-0.05, 0.45) # Smallest and largest profile shift of the shaft
+
+tolerance_grades = range(5, 13)
+deviation_letters = "FGHJKMabcdefghjkmnprstuv" # In sorted order. Capital letters are hub deviations.
+machining_methods = ("broaching", "hobbing", "gear shaping", "cold rolling")
+fillet_methods = ("chip-removal", "cold rolling")
+
+### Catalogue Layout
+
+# Gear parameters of parameters() in GearSplineGenerator_Rev4.py, and the measurements over pins
+parameter_keys = ["cFmin", "pitch", "z2", "x1", "x2", "hap", "hfp", "hP", "cP", "rho", "dp", "db", "da1", "df1",
+                  "dFf1", "da2", "df2", "dFf2", "cFP", "rb", "rp", "ra1", "rf1", "rFf1", "ra2", "rf2", "rFf2",
+                  "p_sector", "MoP_shaft", "d_pin_shaft", "MoP_hub", "d_pin_hub"]
+
+gear_dtype = np.dtype([("dB", np.float64), ("mod", np.float64), ("z1", np.int32),
+                       ("MachMethod", np.int8), # Index in machining_methods
+                       ("FilletMethod", np.int8)] # Index in fillet_methods
+                      + [(key, np.float64) for key in parameter_keys])
+
+# The tolerance rows hold the same values for a shaft and a hub under common names. tolerance_names
+# gives the names that tolerances() in GearSplineGenerator_Rev4.py uses for each side.
+tolerance_keys = ["A", "T_act", "T_eff", "s1", "effective", "actual_max", "actual_min", "nominal"]
+tolerance_names = {"shaft": dict(zip(tolerance_keys, ["As", "T_act_s", "T_eff_s", "s1", "s_vmax", "s_max", "s_min", "s"])),
+                   "hub": dict(zip(tolerance_keys, ["Ae", "T_act_e", "T_eff_e", "e2", "e_vmin", "e_max", "e_min", "e"]))}
+
+tolerance_dtype = np.dtype([("dB", np.float64), ("mod", np.float64), ("z1", np.int32), ("TolGrade", np.int8),
+                            ("DevLetter", "U1"),
+                            ("gear", np.int32)] # First of the 8 method rows of the gear in gears.npy
+                           + [(key, np.float64) for key in tolerance_keys])
+
+# Below is a function that returns which designations can be packed into a key exactly: dB a whole
+# number of mm, m on the 0.01 mm grid up to 20.47 mm, z up to 1023 and a tolerance grade up to 15.
+# Other values would be rounded or spill into the bits of the next field and give the key of another
+# designation. It works on single values and on arrays.
+def key_in_range(dB, mod, z1, TolGrade):
+    dB, mod, z1, TolGrade = (np.asarray(value, dtype = float) for value in (dB, mod, z1, TolGrade))
+    with np.errstate(invalid = "ignore"):
+        return ((dB == np.rint(dB)) & (dB >= 0) & (dB < 2**52) & (np.abs(mod * 100 - np.rint(mod * 100)) <= 1e-9 * mod * 100)
+                & (mod > 0) & (np.rint(mod * 100) < 2**11) & (z1 == np.rint(z1)) & (z1 >= 0) & (z1 < 2**10)
+                & (TolGrade == np.rint(TolGrade)) & (TolGrade >= 0) & (TolGrade < 2**4))
+
+# Below is a function that packs designations into the 64 bit integer keys of the index. The keys sort
+# like (dB, m, z, tolerance grade, deviation letter). It works on single values and on arrays, and raises
+# a ValueError for values that don't fit in their field (see key_in_range).
+def designation_key(dB, mod, z1, TolGrade, DevLetter):
+    letters = np.array(list(deviation_letters))
+    code = np.minimum(np.searchsorted(letters, DevLetter), len(letters) - 1)
+    if np.any(letters[code] != DevLetter):
+        raise ValueError("Invalid deviation letter in " + repr(DevLetter))
+    if not np.all(key_in_range(dB, mod, z1, TolGrade)):
+        raise ValueError("dB must be a whole number, m a multiple of 0.01 up to 20.47, z up to 1023 and the grade up to 15")
+    key = np.rint(np.asarray(dB, dtype = float)).astype(np.int64) << 11 # dB up to 2**52 mm
+    key = (key | np.rint(np.asarray(mod, dtype = float) * 100).astype(np.int64)) << 10 # m in 0.01 mm, up to 20.47 mm
+    key = (key | np.asarray(z1, dtype = np.int64)) << 4 # z up to 1023
+    key = (key | np.asarray(TolGrade, dtype = np.int64)) << 5
+    return key | code
+
+# Below is a function that returns the (dB, m, z) of every gear in the catalogue, in sorted order
+def grid():
+    gears = []
+    for dB in reference_diameters:
+        for mod in modules:
+            for z1 in range(teeth_range[0], teeth_range[1] + 1):
+                x1 = gsg.profile_shift(dB, mod, z1)
+                if shift_range[0] - 1e-9 <= x1 <= shift_range[1] + 1e-9:
+                    gears.append((dB, mod, z1))
+    return gears
+
+### Catalogue Build
+
+# Below is a function that computes every catalogue row of one gear. It runs on the worker processes.
+def build_gear(dB, mod, z1):
+    gears = np.zeros(len(machining_methods) * len(fillet_methods), dtype = gear_dtype)
+    # The measurement over pins is NaN for a few small hubs, where the pin diameter rounded to 0.5 mm
+    # doesn't fit in the space width
+    with np.errstate(invalid = "ignore"):
+        pins = gsg.pins(z1, gsg.profile_shift(dB, mod, z1), mod) + gsg.pins(-z1, -gsg.profile_shift(dB, mod, z1), mod)
+    row = 0
+    for i, MachMethod in enumerate(machining_methods):
+        for j, FilletMethod in enumerate(fillet_methods):
+            params = gsg.parameters(dB, mod, z1, MachMethod, FilletMethod)
+            gears[row] = (dB, mod, z1, i, j) + tuple(params[key] for key in parameter_keys[:-4]) + pins
+            row += 1
+
+    tols = np.zeros(len(tolerance_grades) * len(deviation_letters), dtype = tolerance_dtype)
+    row = 0
+    for TolGrade in tolerance_grades:
+        for DevLetter in deviation_letters:
+            side = "hub" if DevLetter.isupper() else "shaft"
+            tol = gsg.tolerances(dB, mod, z1, TolGrade, DevLetter, side)
+            tols[row] = (dB, mod, z1, TolGrade, DevLetter, 0) + tuple(tol[tolerance_names[side][key]] for key in tolerance_keys)
+            row += 1
+    return gears, tols
+
+# Below is a function that builds the catalogue into a folder, on a pool of worker processes (all cores
+# by default). It returns the number of tolerance rows (designations) in the catalogue.
+def build(folder = catalogue_dir, workers = None):
+    gears = grid()
+    with ProcessPoolExecutor(max_workers = workers or os.cpu_count()) as pool:
+        results = list(pool.map(build_gear, *zip(*gears), chunksize = 8))
+
+    gear_table = np.concatenate([result[0] for result in results])
+    tols = []
+    for number, (gear_rows, tol_rows) in enumerate(results):
+        tol_rows["gear"] = number * len(gear_rows)
+        tols.append(tol_rows)
+    tols = np.concatenate(tols)
+    keys = designation_key(tols["dB"], tols["mod"], tols["z1"], tols["TolGrade"], tols["DevLetter"])
+    order = np.argsort(keys, kind = "stable")
+
+    os.makedirs(folder, exist_ok = True)
+    np.save(os.path.join(folder, "gears.npy"), gear_table)
+    np.save(os.path.join(folder, "tolerances.npy"), tols[order])
+    np.save(os.path.join(folder, "index.npy"), keys[order])
+    return len(tols)
+
+### Catalogue Lookups
+
+# Below is a function that opens a catalogue memory-mapped. It returns {"gears", "tolerances", "index"}.
+def open_catalogue(folder = catalogue_dir):
+    return {name: np.load(os.path.join(folder, name + ".npy"), mmap_mode = "r") for name in ("gears", "tolerances", "index")}
+
+# Below is a function that finds designation keys (from designation_key) with a binary search on the
+# index. It returns the tolerance row of every key, -1 for the keys that aren't in the catalogue.
+def find(catalogue, keys):
+    index = catalogue["index"]
+    rows = np.minimum(np.searchsorted(index, keys), len(index) - 1)
+    return np.where(index[rows] == keys, rows, -1)
+
+# Below is a function that finds the tolerance rows of parsed designations (arrays of the values from
+# parse_designation in GearSplineGenerator_Rev4.py). It returns -1 for the designations that aren't in
+# the catalogue, and checks that every row found is the designation that was asked for.
+def designation_rows(catalogue, side, dB, mod, z1, TolGrade, DevLetter):
+    side, dB, mod, z1, TolGrade, DevLetter = np.broadcast_arrays(*(np.atleast_1d(value) for value in (side, dB, mod, z1, TolGrade, DevLetter)))
+    valid = (np.isin(DevLetter, list(deviation_letters)) & (np.char.isupper(DevLetter) == (side == "hub"))
+             & key_in_range(dB, mod, z1, TolGrade))
+    rows = np.full(dB.shape, -1, dtype = np.int64)
+    rows[valid] = find(catalogue, designation_key(dB[valid], mod[valid], z1[valid], TolGrade[valid].astype(int), DevLetter[valid]))
+    found = rows >= 0
+    tols = catalogue["tolerances"][rows[found]]
+    same = ((tols["dB"] == dB[found]) & (tols["mod"] == mod[found]) & (tols["z1"] == z1[found])
+            & (tols["TolGrade"] == TolGrade[found]) & (tols["DevLetter"] == DevLetter[found]))
+    rows[np.flatnonzero(found)[~same]] = -1
+    return rows
+
+# Below is a function that returns the gear row of tolerance rows for a machining and fillet method
+def gear_rows(catalogue, rows, MachMethod, FilletMethod):
+    offset = machining_methods.index(MachMethod) * len(fillet_methods) + fillet_methods.index(FilletMethod)
+    return catalogue["tolerances"]["gear"][rows] + offset
+
+# Below is a function that looks up one designation, ex: "N45x2x21x9H". It returns a dictionary with the
+# keys of generate() in GearSplineGenerator_Rev4.py: every gear parameter, the tolerances of the side
+# of the designation and the measurements over pins.
+def lookup(catalogue, designation, MachMethod, FilletMethod):
+    side, dB, mod, z1, TolGrade, DevLetter = gsg.parse_designation(designation)
+    row = -1
+    if DevLetter.isupper() == (side == "hub"):
+        try:
+            row = int(find(catalogue, designation_key(dB, mod, z1, TolGrade, DevLetter)))
+        except ValueError: # A deviation letter or a value that can't be packed into a key
+            pass
+    tol = catalogue["tolerances"][row]
+    if row < 0 or (tol["dB"], tol["mod"], tol["z1"], tol["TolGrade"], tol["DevLetter"]) != (dB, mod, z1, TolGrade, DevLetter):
+        raise KeyError(designation + " is not in the catalogue")
+    gear = catalogue["gears"][gear_rows(catalogue, row, MachMethod, FilletMethod)]
+    result = {"designation": designation.replace(" ", ""), "side": side, "dB": dB, "mod": mod, "z1": z1,
+              "TolGrade": TolGrade, "DevLetter": DevLetter, "MachMethod": MachMethod, "FilletMethod": FilletMethod}
+    result.update((key, float(gear[key])) for key in parameter_keys)
+    result.update((tolerance_names[side][key], float(tol[key])) for key in tolerance_keys)
+    return result
+
+# Below is a function that prints the values of one designation for every machining and fillet method
+def print_lookup(catalogue, designation):
+    side = gsg.parse_designation(designation)[0]
+    n = "1" if side == "shaft" else "2"
+    limits = ("s_min", "s_max") if side == "shaft" else ("e_min", "e_max")
+    print(designation)
+    print("Machining      Fillet          d_a%s      d_f%s     d_Ff%s   %s   %s      MoP    d_pin" % (n, n, n, *limits))
+    for MachMethod in machining_methods:
+        for FilletMethod in fillet_methods:
+            g = lookup(catalogue, designation, MachMethod, FilletMethod)
+            print("%-14s %-12s %9.4f %9.4f %9.4f %7.4f %7.4f %9.4f %6.1f" % (MachMethod, FilletMethod, g["da" + n], g["df" + n],
+                  g["dFf" + n], g[limits[0]], g[limits[1]], g["MoP_" + side], g["d_pin_" + side]))
+
+### Measurement Over Pins Acceptance Limits
+
+# Tolerance columns that are turned into measurement over pins limits, in the order of limit_keys in
+# GearSplineGenerator_Rev4.py (s_min, s_max, s_vmax for a shaft and e_min, e_max, e_vmin for a hub)
+limit_columns = ("actual_min", "actual_max", "effective")
+
+# Below is a function that computes the measurement over pins limits of tolerance rows of a catalogue
+# (every row when rows is None) in one call. The form and tip diameters don't depend on the methods,
+# so the first method row of each gear is used. It returns mop_limits() of GearSplineGenerator_Rev4.py.
+def catalogue_mop_limits(catalogue, rows = None, pin_set = gsg.gauge_pins):
+    tols = catalogue["tolerances"] if rows is None else catalogue["tolerances"][rows]
+    gears = catalogue["gears"][tols["gear"]]
+    hub = np.char.isupper(tols["DevLetter"])
+    widths = np.column_stack([tols[key] for key in limit_columns])
+    return gsg.mop_limits(tols["z1"], tols["mod"], widths, np.where(hub, "hub", "shaft"),
+                          np.where(hub, gears["dFf2"], gears["dFf1"]), np.where(hub, gears["da2"], gears["da1"]),
+                          pin_set = pin_set)
+
+# Below is a function that makes the inspection sheet of a list of designations: the pin diameter and
+# the accepted measurement over pins range of each one. It is written to a CSV file when filename is
+# given, and returned as a dictionary of columns.
+def qa_sheet(catalogue, designations, filename = None, pin_set = gsg.gauge_pins):
+    parsed = [gsg.parse_designation(designation) for designation in designations]
+    rows = designation_rows(catalogue, *(np.array(column) for column in zip(*parsed)))
+    if np.any(rows < 0):
+        raise KeyError("Not in the catalogue: " + ", ".join(np.array(designations)[rows < 0]))
+
+    limits = catalogue_mop_limits(catalogue, rows, pin_set)
+    widths = np.column_stack([catalogue["tolerances"][key][rows] for key in limit_columns])
+    sheet = {"designation": [designation.replace(" ", "") for designation in designations], "d_pin": limits["d_pin"],
+             "width_min": widths[:, 0], "width_max": widths[:, 1], "width_effective": widths[:, 2],
+             "MoP_low": np.minimum(limits["MoP"][:, 0], limits["MoP"][:, 1]),
+             "MoP_high": np.maximum(limits["MoP"][:, 0], limits["MoP"][:, 1]),
+             "MoP_effective": limits["MoP"][:, 2]}
+    if filename is not None:
+        with open(filename, "w") as file:
+            file.write("Designation,Pin diameter,Width min,Width max,Width effective,MoP low,MoP high,MoP effective\n")
+            for k, designation in enumerate(sheet["designation"]):
+                file.write("%s,%g,%.4f,%.4f,%.4f,%.4f,%.4f,%.4f\n" % (designation, sheet["d_pin"][k], sheet["width_min"][k],
+                           sheet["width_max"][k], sheet["width_effective"][k], sheet["MoP_low"][k], sheet["MoP_high"][k],
+                           sheet["MoP_effective"][k]))
+    return sheet
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        rows = build(sys.argv[2] if len(sys.argv) > 2 else catalogue_dir)
+        print(rows, "designations written to the catalogue in %.2f s" % (time.perf_counter() - start))
+    elif len(sys.argv) > 3 and sys.argv[1] == "qa":
+        with open(sys.argv[2]) as file:
+            designations = [line.strip() for line in file if line.strip() and not line.startswith("#")]
+        qa_sheet(open_catalogue(sys.argv[4] if len(sys.argv) > 4 else catalogue_dir), designations, sys.argv[3])
+        print(len(designations), "designations written to", sys.argv[3], "in %.2f s" % (time.perf_counter() - start))
+    elif len(sys.argv) > 1:
+        print_lookup(open_catalogue(sys.argv[2] if len(sys.argv) > 2 else catalogue_dir), sys.argv[1])
+    else:
+        print("Usage: python SplineCatalogue.py build [folder]")
+        print("       python SplineCatalogue.py <designation> [folder]")
+        print("       python SplineCatalogue.py qa <designations file> <sheet.csv> [folder]")
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+# This script simulates the manufacturing errors of every tooth of a shaft and hub pair (from an EDM
+# or a hob for example) with many Monte Carlo realizations, and shows how they change the tooth
+# thickness, space width and fit. GearSplineGenerator_Rev4.py draws every tooth as an exact rotated
+# copy of the first one; here every tooth k of every realization gets its own deviations:
+    # pitch   cumulative pitch deviation, the tangential position error of the tooth on the pitch
+    #         circle (mm). Random pitches come from the single pitch deviations f_pt.
+    # radial  radial position error of the tooth (mm). Random runout comes from an eccentricity with
+    #         the runout F_r = 2 x eccentricity, which also adds to the pitch deviations.
+    # slope_L, slope_R
+    #         profile slope deviation f_Ha of the L and R flank (mm): the flank deviation grows
+    #         linearly by f_Ha from the start to the end of the evaluation range (inner to outer
+    #         radius), with no deviation in the middle of the range.
+# The deviations can be random (random_fields) or measured: any dictionary with those four arrays,
+# shaped (teeth) or (realizations, teeth), can be used.
+
+# Every deviation is turned into a normal deviation of the flanks (positive means more material, like
+# in CMMDeviationAnalysis.py). The normal of an involute is tangent to the base circle, so moving a
+# flank by dt on the pitch circle moves it by dt * cos(alpha) along its normal, and moving it by dr
+# outwards moves it by about dr * sin(alpha) along its normal. From the normal deviations:
+    # actual tooth thickness (space width) of every tooth on the pitch circle, like the CMM report
+    # effective tooth thickness (space width): the one an error free hub (shaft) would feel, from the
+    #   largest deviation of every flank side anywhere on the flanks
+    # clearance: the smallest normal flank clearance of the pair when the hub is turned to the middle
+    #   of its play, negative when the parts can't be assembled
+    # measurement over pins of the thinnest and thickest tooth (narrowest and widest space width), with
+    #   the pin of mop_acceptance() in GearSplineGenerator_Rev4.py
+# Everything is vectorized over the teeth and the realizations, and the shaft and hub are assumed to
+# be on the same axis.
+
+import numpy as np
+
+import GearSplineGenerator_Rev4 as gsg
+
+field_keys = ("pitch", "radial", "slope_L", "slope_R")
+
+# Below is a function that makes random deviation fields for z1 teeth. f_pt, F_r and f_Ha are standard
+# deviations (mm) of the single pitch deviation, the runout and the profile slope deviation.
+def random_fields(z1, realizations, f_pt = 0, F_r = 0, f_Ha = 0, seed = None):
+    rng = np.random.default_rng(seed)
+    # The single pitch deviations of a whole turn add up to zero, so their sum is spread over the turn
+    single = rng.normal(0, f_pt, (realizations, z1))
+    cumulative = np.cumsum(single, axis = 1)
+    cumulative -= np.arange(1, z1 + 1) / z1 * cumulative[:, -1:]
+
+    angles = gsg.pitch_angles(z1)
+    ex, ey = rng.normal(0, F_r / 2, (2, realizations, 1)) # Eccentricity
+    return {"pitch": cumulative - ex * np.sin(angles) + ey * np.cos(angles),
+            "radial": ex * np.cos(angles) + ey * np.sin(angles),
+            "slope_L": rng.normal(0, f_Ha, (realizations, z1)),
+            "slope_R": rng.normal(0, f_Ha, (realizations, z1))}
+
+def roll(radius, rb): # Roll length of the involute at a radius
+    return np.sqrt(radius**2 - rb**2)
+
+# Below is a function that returns the evaluation range (inner and outer radius) of the flanks of one side
+def flank_range(gear, side):
+    return (gear["rFf1"], gear["ra1"]) if side == "shaft" else (gear["ra2"], gear["rFf2"])
+
+# Below is a function that returns the normal deviations of the L and R flanks of every tooth (space
+# width for a hub) at the radii r, shaped (realizations, teeth, radii). Positive is more material.
+def flank_deviations(gear, side, fields, radii):
+    z1 = gear["z1"]
+    rb = gear["rb"]
+    pitch, radial, slope_L, slope_R = (np.atleast_2d(np.broadcast_to(fields[key], np.shape(fields[key])[:-1] + (z1,)))[:, :, None]
+                                       for key in field_keys)
+    radii = np.asarray(radii, dtype = float)
+    low, high = roll(np.array(flank_range(gear, side)), rb)
+    position = (roll(radii, rb) - (low + high) / 2) / (high - low) # -1/2..1/2 over the range
+
+    # Moving a shaft tooth moves the material, moving a hub tooth moves the space width the other way.
+    # Turning a tooth by dt / rp moves its flanks by rb * dt / rp = dt * cos(alpha) along their normals.
+    # Moving it outwards along its axis moves a flank point by dr * sin(alpha_r - delta_r) along its
+    # normal, with alpha_r the pressure angle at the radius and delta_r the polar angle of the point
+    # from the axis (sin(alpha) for a thin tooth on the pitch circle).
+    sgn = 1 if side == "shaft" else -1
+    width = gear["s"] if side == "shaft" else gear["e"]
+    delta = width / (2 * gear["rp"]) + gsg.inv(gsg.alpha) - gsg.invr(radii, rb)
+    shift = sgn * pitch * np.cos(gsg.alpha) # Towards the positive (R) side
+    grow = sgn * radial * np.sin(np.arccos(rb / radii) - delta)
+    return grow - shift + slope_L * position, grow + shift + slope_R * position
+
+# Below is a function that computes the actual and effective tooth thickness (shaft) or space width
+# (hub) of every realization. It returns {"actual": (realizations, teeth), "effective": (realizations)}.
+def thickness(gear, side, fields):
+    low, high = flank_range(gear, side)
+    dev_L, dev_R = flank_deviations(gear, side, fields, [gear["rp"], low, high]) # The largest deviations are at the ends
+    change = (dev_L[:, :, 0] + dev_R[:, :, 0]) / np.cos(gsg.alpha) # On the pitch circle
+    effective_change = (dev_L.max(axis = (1, 2)) + dev_R.max(axis = (1, 2))) / np.cos(gsg.alpha)
+    if side == "shaft":
+        return {"actual": gear["s"] + change, "effective": gear["s"] + effective_change}
+    return {"actual": gear["e"] - change, "effective": gear["e"] - effective_change}
+
+# Below is a function that simulates a shaft and hub pair with deviation fields for each of them. It
+# returns arrays with one value per realization: the smallest and largest actual tooth thickness and
+# space width, the effective ones, the clearance (mm, normal to the flanks), the measurement over
+# pins range and whether the shaft, the hub and the fit are within their limits.
+def simulate(gear, shaft_fields, hub_fields, pin_set = gsg.gauge_pins):
+    shaft = thickness(gear, "shaft", shaft_fields)
+    hub = thickness(gear, "hub", hub_fields)
+
+    # The flanks touch between the larger of the inner radii and the smaller of the outer radii. The
+    # deviations change monotonically along the flanks, so the smallest clearance is at one of the ends.
+    contact = [max(gear["rFf1"], gear["ra2"]), min(gear["ra1"], gear["rFf2"])]
+    shaft_L, shaft_R = flank_deviations(gear, "shaft", shaft_fields, contact)
+    hub_L, hub_R = flank_deviations(gear, "hub", hub_fields, contact)
+    nominal = (gear["e"] - gear["s"]) * np.cos(gsg.alpha) / 2 # Clearance of each flank without errors
+    gap_L = (nominal - shaft_L - hub_L).min(axis = (1, 2))
+    gap_R = (nominal - shaft_R - hub_R).min(axis = (1, 2))
+    clearance = (gap_L + gap_R) / 2 # The hub is turned until both sides have the same clearance
+
+    result = {"s_actual_min": shaft["actual"].min(axis = 1), "s_actual_max": shaft["actual"].max(axis = 1),
+              "s_effective": shaft["effective"], "e_actual_min": hub["actual"].min(axis = 1),
+              "e_actual_max": hub["actual"].max(axis = 1), "e_effective": hub["effective"], "clearance": clearance}
+    result["shaft_ok"] = ((result["s_actual_min"] >= gear["s_min"]) & (result["s_actual_max"] <= gear["s_max"])
+                          & (result["s_effective"] <= gear["s_vmax"]))
+    result["hub_ok"] = ((result["e_actual_min"] >= gear["e_min"]) & (result["e_actual_max"] <= gear["e_max"])
+                        & (result["e_effective"] >= gear["e_vmin"]))
+    result["fits"] = clearance >= 0
+
+    acceptance = gsg.mop_acceptance(gear, pin_set)
+    for side, n, key in (("shaft", "1", "s"), ("hub", "2", "e")):
+        widths = np.column_stack((result[key + "_actual_min"], result[key + "_actual_max"]))
+        MoP = gsg.mop_limits(gear["z1"], gear["mod"], widths.ravel(), side, gear["dFf" + n], gear["da" + n],
+                             acceptance["d_pin_limits_" + side])["MoP"].reshape(widths.shape)
+        result["MoP_" + side + "_min"] = MoP.min(axis = 1)
+        result["MoP_" + side + "_max"] = MoP.max(axis = 1)
+    result["d_pin_shaft"] = acceptance["d_pin_limits_shaft"]
+    result["d_pin_hub"] = acceptance["d_pin_limits_hub"]
+    return result
+
+# Below is a function that applies one realization of deviation fields to a profile. Every tooth is
+# turned and moved outwards as a whole, and the points of the flanks are moved along their normals
+# by the profile slope deviation. It returns a new GearProfile, which can be written to a DXF file or
+# checked with CMMDeviationAnalysis.py.
+def deviated_profile(gear, side, fields, realization = 0):
+    profile = gear[side]
+    z1 = profile.z1
+    field = {key: np.atleast_2d(np.broadcast_to(fields[key], np.shape(fields[key])[:-1] + (z1,)))[realization] for key in field_keys}
+    segments = profile.segments
+    coords = profile.coords.copy()
+    angles = gsg.pitch_angles(z1)
+    sgn = 1 if side == "shaft" else -1
+    low, high = roll(np.array(flank_range(gear, side)), gear["rb"])
+    for row in range(len(segments)):
+        k = segments["tooth"][row]
+        rows = slice(segments["start"][row], segments["start"][row] + segments["count"][row])
+        xy = coords[rows]
+        if segments["type"][row] in (gsg.FLANK_L, gsg.FLANK_R):
+            # The normal of an involute point is tangent to the base circle. It points away from a shaft
+            # tooth and into a hub tooth.
+            radius = np.hypot(xy[:, 0], xy[:, 1])
+            polar = np.arctan2(xy[:, 1], xy[:, 0])
+            turn = np.arccos(np.clip(gear["rb"] / radius, -1, 1))
+            R = 1 if segments["type"][row] == gsg.FLANK_R else -1
+            normal_angle = polar + R * (np.pi / 2 - turn)
+            slope = field["slope_R" if R == 1 else "slope_L"][k]
+            deviation = slope * ((roll(radius, gear["rb"]) - (low + high) / 2) / (high - low))
+            xy += sgn * deviation[:, None] * np.column_stack((np.cos(normal_angle), np.sin(normal_angle)))
+        turn = field["pitch"][k] / gear["rp"]
+        xy[:] = xy @ np.array([[np.cos(turn), np.sin(turn)], [-np.sin(turn), np.cos(turn)]])
+        xy += field["radial"][k] * np.array([np.cos(angles[k]), np.sin(angles[k])])
+    return gsg.GearProfile(side, z1, profile.thetaHK, coords, segments.copy())
+
+# Below is a function that prints a summary of a simulation
+def print_summary(gear, result):
+    count = len(result["clearance"])
+    print("")
+    print(count, "realizations")
+    for name, keys, limits in (("Shaft tooth thickness", ("s_actual_min", "s_actual_max", "s_effective"), ("s_min", "s_max", "s_vmax")),
+                               ("Hub space width", ("e_actual_min", "e_actual_max", "e_effective"), ("e_min", "e_max", "e_vmin"))):
+        print(name + " (mm)      min of min   max of max   effective range     limits (min, max, effective)")
+        print("%24s %12.4f %12.4f   %7.4f - %7.4f   %.4f, %.4f, %.4f" % ("", result[keys[0]].min(), result[keys[1]].max(),
+              result[keys[2]].min(), result[keys[2]].max(), *(gear[key] for key in limits)))
+    for side in ("shaft", "hub"):
+        print("Measurement over %.4g mm pins of the %s (mm): %.4f - %.4f" % (result["d_pin_" + side], side,
+              result["MoP_" + side + "_min"].min(), result["MoP_" + side + "_max"].max()))
+    print("Shaft within its limits: %.1f %%" % (100 * result["shaft_ok"].mean()))
+    print("Hub within its limits: %.1f %%" % (100 * result["hub_ok"].mean()))
+    print("Clearance (mm): min %.4f, 1%% %.4f, median %.4f" % (result["clearance"].min(),
+          np.percentile(result["clearance"], 1), np.median(result["clearance"])))
+    print("Pairs that can be assembled: %.1f %%" % (100 * result["fits"].mean()))
+
+if __name__ == "__main__":
+    dB = float(input("Enter the Reference Diameter (d_B): "))
+    mod = float(input("Enter the Module (m): "))
+    z1 = int(input("Enter the number of teeth (z): "))
+    TolGrade_s = float(input("Enter the tolerance grade number for the shaft: "))
+    DevLetter_s = input("Enter the deviation grade letter for the shaft: ")
+    TolGrade_e = float(input("Enter the tolerance grade number for the hub: "))
+    DevLetter_e = input("Enter the deviation grade letter for the hub: ")
+    MachMethod = input("Enter the machining method (broaching, hobbing, gear shaping, or cold rolling): ")
+    FilletMethod = input("Enter the creation method for the root fillet (chip-removal or cold rolling): ")
+    shaft_errors = [float(value) for value in input("Enter the standard deviations of f_pt, F_r, f_Ha for the shaft in mm (ex: 0.005, 0.01, 0.004): ").split(",")]
+    hub_errors = [float(value) for value in input("Enter the standard deviations of f_pt, F_r, f_Ha for the hub in mm: ").split(",")]
+    realizations = int(input("Enter the number of realizations: "))
+
+    gear = gsg.generate(dB, mod, z1, TolGrade_s, DevLetter_s, TolGrade_e, DevLetter_e, MachMethod, FilletMethod)
+    result = simulate(gear, random_fields(z1, realizations, *shaft_errors), random_fields(z1, realizations, *hub_errors))
+    print_summary(gear, result)